@@ -18,10 +18,67 @@
 
 """Core logic for thoth-python test suite."""
 
+import hashlib
+import io
 import os
+import tarfile
+
+import pytest
+from aiohttp import web
+
+from thoth.python.cache import cache
 
 
 class PythonTestCase:
     """A base class for python test cases."""
 
     data_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "data")
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        """Do not share results of index queries cached in-process across tests."""
+        cache.clear()
+        yield
+        cache.clear()
+
+    _SDIST_METADATA = (
+        b"Metadata-Version: 2.1\n"
+        b"Name: selinon\n"
+        b"Version: 1.0.0\n"
+        b"Requires-Dist: pyyaml\n"
+        b"Requires-Dist: rainbow-logging-handler\n"
+    )
+
+    def _create_sdist_index(self, tmp_path):
+        """Create a simple repository listing only an sdist of selinon, the sdist is served honoring Range requests."""
+        sdist_path = tmp_path / "selinon-1.0.0.tar.gz"
+        with tarfile.open(sdist_path, "w:gz") as tar:
+            for name, content in (("PKG-INFO", self._SDIST_METADATA), ("setup.py", b"")):
+                info = tarfile.TarInfo(f"selinon-1.0.0/{name}")
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+
+        async def listing(request):
+            return web.json_response(
+                {
+                    "meta": {"api-version": "1.0"},
+                    "name": "selinon",
+                    "files": [
+                        {
+                            "filename": sdist_path.name,
+                            "url": str(request.url.join(request.app.router["sdist"].url_for())),
+                            "hashes": {"sha256": hashlib.sha256(sdist_path.read_bytes()).hexdigest()},
+                        }
+                    ],
+                },
+                content_type="application/vnd.pypi.simple.v1+json",
+            )
+
+        async def sdist(request):
+            # FileResponse responds to Range requests with partial content.
+            return web.FileResponse(sdist_path)
+
+        app = web.Application()
+        app.router.add_get("/simple/selinon", listing)
+        app.router.add_get(f"/packages/{sdist_path.name}", sdist, name="sdist")
+        return app
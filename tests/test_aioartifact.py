@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Tests for artifacts accessed asynchronously."""
+
+import asyncio
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from flexmock import flexmock
+
+from thoth.python.aioartifact import AsyncArtifact
+from thoth.python.artifact import Artifact
+from thoth.python.configuration import config
+from thoth.python.exceptions import ArtifactDigestMismatchError
+from thoth.python.session import get_session
+
+from .base import PythonTestCase
+
+
+class TestAsyncArtifact(PythonTestCase):
+    """Test artifacts accessed asynchronously."""
+
+    _WHEEL = "tensorflow_serving_api-1.13.0-py2.py3-f29-any.whl"
+
+    @pytest.mark.asyncio
+    async def test_download(self):
+        """Test the artifact is downloaded once and inspected without blocking."""
+        with open(os.path.join(self.data_dir, self._WHEEL), "rb") as f:
+            content = f.read()
+
+        requests = []
+
+        async def handler(request):
+            requests.append(request.path)
+            return web.Response(body=content)
+
+        app = web.Application()
+        app.router.add_get(f"/{self._WHEEL}", handler)
+        async with TestServer(app) as server:
+            artifact = AsyncArtifact(self._WHEEL, str(server.make_url(f"/{self._WHEEL}")))
+            hashes, symbols = await asyncio.gather(artifact.gather_hashes(), artifact.get_versioned_symbols())
+            assert await artifact.sha() == hashlib.sha256(content).hexdigest()
+
+        assert requests == [f"/{self._WHEEL}"]
+        expected = Artifact(self._WHEEL, "", os.path.join(self.data_dir, self._WHEEL))
+        assert hashes == expected.gather_hashes()
+        assert symbols == expected.get_versioned_symbols()
+
+        compressed_file = artifact.compressed_file
+        assert os.path.exists(compressed_file)
+        del artifact
+        assert not os.path.exists(compressed_file)
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self):
+        """Test the artifact is inspected in a process pool passed."""
+        path = os.path.join(self.data_dir, self._WHEEL)
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            artifact = AsyncArtifact(self._WHEEL, "", compressed_file=path, executor=executor)
+            hashes = await artifact.gather_hashes()
+            metadata = await artifact.read_metadata()
+
+        expected = Artifact(self._WHEEL, "", path)
+        assert hashes == expected.gather_hashes()
+        assert metadata == expected.read_metadata()
+        # Files given are left untouched by workers.
+        assert os.path.exists(path)
+
+    @pytest.mark.asyncio
+    async def test_result_store(self, tmp_path, monkeypatch):
+        """Test the artifact is downloaded asynchronously unless results are stored in the result store."""
+        monkeypatch.setattr(config, "result_store_path", str(tmp_path / "results.db"))
+        with open(os.path.join(self.data_dir, self._WHEEL), "rb") as f:
+            content = f.read()
+
+        sha = hashlib.sha256(content).hexdigest()
+        requests = []
+
+        async def handler(request):
+            requests.append(request.path)
+            return web.Response(body=content)
+
+        # The blocking session is never used to download the artifact.
+        flexmock(get_session()).should_receive("get").never()
+
+        app = web.Application()
+        app.router.add_get(f"/{self._WHEEL}", handler)
+        async with TestServer(app) as server:
+            url = str(server.make_url(f"/{self._WHEEL}"))
+            artifact = AsyncArtifact(self._WHEEL, url, sha=sha)
+            hashes = await artifact.gather_hashes()
+            symbols = await artifact.get_versioned_symbols()
+            assert requests == [f"/{self._WHEEL}"]
+
+            artifact = AsyncArtifact(self._WHEEL, url, sha=sha)
+            assert await artifact.gather_hashes() == hashes
+            assert await artifact.get_versioned_symbols() == symbols
+            assert artifact.compressed_file is None
+            assert requests == [f"/{self._WHEEL}"]
+
+    @pytest.mark.asyncio
+    async def test_digest_mismatch(self):
+        """Test an artifact not matching the digest stated is not used."""
+
+        async def handler(request):
+            return web.Response(body=b"not a wheel")
+
+        app = web.Application()
+        app.router.add_get(f"/{self._WHEEL}", handler)
+        async with TestServer(app) as server:
+            artifact = AsyncArtifact(self._WHEEL, str(server.make_url(f"/{self._WHEEL}")), sha="0" * 64)
+            with pytest.raises(ArtifactDigestMismatchError):
+                await artifact.gather_hashes()
+
+        assert artifact.compressed_file is None
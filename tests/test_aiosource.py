@@ -18,9 +18,18 @@
 
 """Tests for package index handling - package source control."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import aiohttp
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 from thoth.python.aiosource import AIOSource, AsyncIterablePackages, AsyncIterableVersions
+from thoth.python.configuration import config
+from thoth.python.exceptions import NotFoundError
 
 from .base import PythonTestCase
 
@@ -28,6 +37,231 @@ from .base import PythonTestCase
 class TestAIOSource(PythonTestCase):
     """Test AIOSource module."""
 
+    def _create_index(self):
+        """Create a simple repository serving the JSON listing of selinon renamed for any package but "missing"."""
+        app = web.Application()
+        app["peers"] = set()
+        app["requests"] = 0
+        app["in_flight"] = 0
+        app["max_in_flight"] = 0
+        app["delay"] = 0
+
+        async def handler(request):
+            app["requests"] += 1
+            app["peers"].add(request.transport.get_extra_info("peername"))
+            app["in_flight"] += 1
+            app["max_in_flight"] = max(app["max_in_flight"], app["in_flight"])
+            try:
+                package_name = request.match_info["package_name"]
+                await asyncio.sleep(10 if package_name == "slow" else app["delay"])
+                if package_name == "missing":
+                    raise web.HTTPNotFound()
+
+                return web.Response(
+                    text=(Path(self.data_dir) / "selinon-simple.json").read_text().replace("selinon", package_name),
+                    content_type="application/vnd.pypi.simple.v1+json",
+                )
+            finally:
+                app["in_flight"] -= 1
+
+        app.router.add_get("/simple/{package_name}", handler)
+        return app
+
+    @pytest.mark.asyncio
+    async def test_owned_session(self):
+        """Test the source owns a session reused for requests when used as a context manager."""
+        app = self._create_index()
+        async with TestServer(app) as server:
+            async with AIOSource(str(server.make_url("/simple")), warehouse=False) as source:
+                session = source._owned_session
+                assert session is not None
+                for _ in range(3):
+                    versions = await source._simple_repository_list_versions("selinon")
+                    assert versions == ["1.0.0", "1.1.0"]
+
+            assert session.closed
+            assert source._owned_session is None
+            # Connections were kept alive and reused.
+            assert len(app["peers"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_package_versions_single_flight(self):
+        """Test concurrent queries for versions of the same package issue a single request."""
+        app = self._create_index()
+        async with TestServer(app) as server:
+            async with AIOSource(str(server.make_url("/simple")), warehouse=False) as source:
+                results = await asyncio.gather(*(source.get_package_versions("selinon") for _ in range(50)))
+                assert app["requests"] == 1
+                # Each caller obtains its own iterator.
+                for result in results:
+                    assert {version async for version in result} == {"1.0.0", "1.1.0"}
+
+    @pytest.mark.asyncio
+    async def test_listing_shared(self):
+        """Test the package listing is retrieved once for queries on versions, artifacts and hashes."""
+        app = self._create_index()
+        async with TestServer(app) as server:
+            async with AIOSource(str(server.make_url("/simple")), warehouse=False) as source:
+                versions, artifacts, hashes = await asyncio.gather(
+                    source.get_package_versions("selinon"),
+                    source.get_package_artifacts("selinon", "1.0.0"),
+                    source.get_package_hashes("selinon", "1.0.0"),
+                )
+                assert {version async for version in versions} == {"1.0.0", "1.1.0"}
+                assert [artifact.artifact_name for artifact in artifacts] == [item["name"] for item in hashes]
+                await source.get_package_hashes("selinon", "1.1.0")
+
+        assert app["requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_package_versions_many(self):
+        """Test obtaining versions of multiple packages with bounded concurrency."""
+        app = self._create_index()
+        app["delay"] = 0.01
+        package_names = [f"package{i}" for i in range(20)] + ["missing", "slow"]
+        async with TestServer(app) as server:
+            async with AIOSource(str(server.make_url("/simple")), warehouse=False) as source:
+                results = [
+                    result
+                    async for result in source.get_package_versions_many(package_names, concurrency=4, timeout=0.5)
+                ]
+
+        assert app["max_in_flight"] == 4
+        assert sorted(result.package_name for result in results) == sorted(package_names)
+        # The slow package is reported last, once timed out.
+        assert results[-1].package_name == "slow"
+        assert isinstance(results[-1].error, asyncio.TimeoutError)
+        errors = {result.package_name: result.error for result in results if result.error is not None}
+        assert set(errors) == {"missing", "slow"}
+        assert isinstance(errors["missing"], NotFoundError)
+        assert all(result.versions == ["1.0.0", "1.1.0"] for result in results if result.error is None)
+
+    @pytest.mark.asyncio
+    async def test_get_package_hashes_many(self):
+        """Test obtaining hashes of multiple packages with connections limited per host."""
+        app = self._create_index()
+        app["delay"] = 0.01
+        packages = [(f"package{i}", "1.0.0") for i in range(5)] + [("missing", "1.0.0")]
+        async with TestServer(app) as server:
+            source = AIOSource(str(server.make_url("/simple")), warehouse=False)
+            results = [
+                result async for result in source.get_package_hashes_many(packages, concurrency=5, limit_per_host=1)
+            ]
+
+        assert app["max_in_flight"] == 1
+        assert sorted((result.package_name, result.package_version) for result in results) == sorted(packages)
+        for result in results:
+            if result.package_name == "missing":
+                assert isinstance(result.error, NotFoundError)
+                assert result.hashes is None
+            else:
+                assert result.error is None
+                assert [artifact["name"] for artifact in result.hashes] == [
+                    f"{result.package_name}-1.0.0-py3-none-any.whl",
+                    f"{result.package_name}-1.0.0.tar.gz",
+                ]
+
+    @pytest.mark.asyncio
+    async def test_get_packages_streamed(self):
+        """Test package names are produced while the root listing is being downloaded."""
+        received = asyncio.Event()
+
+        async def handler(request):
+            response = web.StreamResponse(headers={"Content-Type": "text/html"})
+            await response.prepare(request)
+            await response.write(b'<html><body><a href="/simple/selinon/">selinon</a>')
+            # The rest of the listing is sent once the first package name was consumed.
+            await asyncio.wait_for(received.wait(), 5)
+            await response.write(b'<a href="/simple/thoth-python/">thoth-python</a><a href="/">..</a></body></html>')
+            return response
+
+        app = web.Application()
+        app.router.add_get("/simple", handler)
+        async with TestServer(app) as server:
+            async with AIOSource(str(server.make_url("/simple")), warehouse=False) as source:
+                packages = await source.get_packages()
+                assert type(packages) is AsyncIterablePackages
+                assert await packages.__anext__() == "selinon"
+                received.set()
+                assert [package_name async for package_name in packages] == ["thoth-python"]
+
+    @pytest.mark.asyncio
+    async def test_get_packages_normalized(self):
+        """Test package names stated in links of the root listing are normalized."""
+
+        async def handler(request):
+            return web.Response(
+                text=(
+                    '<html><body><a href="/simple/3to2/">3to2</a><a href="/simple/Django/">Django</a>'
+                    '<a href="/simple/zope.interface/">zope.interface</a><a href="/">..</a></body></html>'
+                ),
+                content_type="text/html",
+            )
+
+        app = web.Application()
+        app.router.add_get("/simple", handler)
+        async with TestServer(app) as server:
+            async with AIOSource(str(server.make_url("/simple")), warehouse=False) as source:
+                packages = await source.get_packages()
+                assert [package_name async for package_name in packages] == ["3to2", "django", "zope-interface"]
+
+    @pytest.mark.asyncio
+    async def test_async_iterable_batches(self):
+        """Test iterating over items given upfront and produced in batches."""
+
+        async def produce():
+            yield ["1.0.0", "1.1.0"]
+            yield []
+            yield ["2.0.0"]
+
+        versions = AsyncIterableVersions(["0.1.0"], produce())
+        assert [batch async for batch in versions.batches()] == [["0.1.0"], ["1.0.0", "1.1.0"], ["2.0.0"]]
+        assert [version async for version in versions] == []
+        assert [version async for version in AsyncIterableVersions({"1.0.0"})] == ["1.0.0"]
+
+        versions = AsyncIterableVersions([], produce())
+        assert await versions.__anext__() == "1.0.0"
+        await versions.aclose()
+        assert [version async for version in versions] == []
+
+    @pytest.mark.asyncio
+    async def test_executor(self, monkeypatch):
+        """Test large documents are parsed in the executor passed."""
+        submitted = []
+
+        class _Executor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.append(fn)
+                return super().submit(fn, *args, **kwargs)
+
+        app = self._create_index()
+        async with TestServer(app) as server:
+            with _Executor(max_workers=1) as executor:
+                source = AIOSource(str(server.make_url("/simple")), warehouse=False, executor=executor)
+                monkeypatch.setattr(config, "offload_min_bytes", 1024 * 1024)
+                assert await source._simple_repository_list_versions("selinon") == ["1.0.0", "1.1.0"]
+                assert submitted == []
+
+                # Listings are cached, query another package.
+                monkeypatch.setattr(config, "offload_min_bytes", 0)
+                assert await source._simple_repository_list_versions("thamos") == ["1.0.0", "1.1.0"]
+                assert len(submitted) == 1
+
+    @pytest.mark.asyncio
+    async def test_passed_session(self):
+        """Test the session passed is used and left open."""
+        async with TestServer(self._create_index()) as server:
+            async with aiohttp.ClientSession() as session:
+                async with AIOSource(str(server.make_url("/simple")), warehouse=False, session=session) as source:
+                    assert source._owned_session is None
+                    assert await source._simple_repository_list_versions("selinon") == ["1.0.0", "1.1.0"]
+
+                assert not session.closed
+
+            # Without a session, a session is created for the request.
+            source = AIOSource(str(server.make_url("/simple")), warehouse=False)
+            assert await source._simple_repository_list_versions("selinon") == ["1.0.0", "1.1.0"]
+
     @pytest.mark.online
     @pytest.mark.timeout(60)
     @pytest.mark.asyncio
@@ -168,3 +402,25 @@ class TestAIOSource(PythonTestCase):
                 return True
 
         return False
+
+    @pytest.mark.asyncio
+    async def test_get_package_metadata_from_sdist(self, tmp_path):
+        """Test obtaining core metadata from an sdist served by a server supporting Range requests."""
+        async with TestServer(self._create_sdist_index(tmp_path)) as server:
+            async with AIOSource(str(server.make_url("/simple")), warehouse=False) as source:
+                metadata = await source.get_package_metadata("selinon", "1.0.0")
+
+        assert metadata["name"] == "selinon"
+        assert metadata["requires_dist"] == ["pyyaml", "rainbow-logging-handler"]
+
+    @pytest.mark.online
+    @pytest.mark.timeout(60)
+    @pytest.mark.asyncio
+    async def test_get_package_metadata(self):
+        """Test get package metadata."""
+        source_info = {"name": "my-pypi", "url": "https://pypi.org/simple", "verify_ssl": True, "warehouse": True}
+
+        source = AIOSource.from_dict(source_info)
+        metadata = await source.get_package_metadata("selinon", "1.0.0")
+        assert metadata["name"] == "selinon"
+        assert "requires_dist" in metadata
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Tests for artifact handling."""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import zipfile
+
+import pytest
+from flexmock import flexmock
+
+from thoth.python.artifact import Artifact
+from thoth.python.configuration import config
+from thoth.python.session import get_session
+
+from .base import PythonTestCase
+
+
+class TestArtifact(PythonTestCase):
+    """Test artifact handling."""
+
+    _WHEEL = "tensorflow_serving_api-1.13.0-py2.py3-f29-any.whl"
+
+    def test_sha_lazy(self):
+        """Test creating an artifact does not download it."""
+        flexmock(get_session()).should_receive("get").never()
+        artifact = Artifact(self._WHEEL, f"https://example.com/{self._WHEEL}")
+        assert artifact.compressed_file is None
+
+    def test_sha_from_url(self):
+        """Test SHA256 stated in URL is used without downloading the artifact."""
+        flexmock(get_session()).should_receive("get").never()
+        artifact = Artifact(self._WHEEL, f"https://example.com/{self._WHEEL}#sha256=abc")
+        assert artifact.sha == "abc"
+
+    def test_sha_computed(self):
+        """Test SHA256 is computed out of artifact content if not stated in URL."""
+        path = os.path.join(self.data_dir, self._WHEEL)
+        with open(path, "rb") as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+
+        artifact = Artifact(self._WHEEL, f"https://example.com/{self._WHEEL}", path)
+        assert artifact.sha == expected
+
+    def test_download_streamed(self):
+        """Test artifacts are downloaded in chunks and hashed while downloading."""
+        with open(os.path.join(self.data_dir, self._WHEEL), "rb") as f:
+            content = f.read()
+
+        class Response:
+            @staticmethod
+            def raise_for_status():
+                pass
+
+            @staticmethod
+            def iter_content(chunk_size):
+                for idx in range(0, len(content), 4096):
+                    yield content[idx : idx + 4096]
+
+            @staticmethod
+            def close():
+                pass
+
+        url = f"https://example.com/{self._WHEEL}"
+        flexmock(get_session()).should_receive("get").with_args(url, verify=False, stream=True).and_return(
+            Response
+        ).once()
+
+        artifact = Artifact(self._WHEEL, url)
+        assert artifact.sha == hashlib.sha256(content).hexdigest()
+        with open(artifact.compressed_file, "rb") as f:
+            assert f.read() == content
+
+        compressed_file = artifact.compressed_file
+        del artifact
+        assert not os.path.exists(compressed_file)
+
+    def test_download_artifact_store(self, tmp_path, monkeypatch):
+        """Test artifacts are downloaded once and kept in the artifact store if configured."""
+        with open(os.path.join(self.data_dir, self._WHEEL), "rb") as f:
+            content = f.read()
+
+        response = flexmock(
+            raise_for_status=lambda: None, iter_content=lambda chunk_size: [content], close=lambda: None
+        )
+        url = f"https://example.com/{self._WHEEL}"
+        flexmock(get_session()).should_receive("get").with_args(url, verify=False, stream=True).and_return(
+            response
+        ).once()
+        monkeypatch.setattr(config, "artifact_store_dir", str(tmp_path))
+
+        artifact = Artifact(self._WHEEL, url)
+        digest = hashlib.sha256(content).hexdigest()
+        assert artifact.sha == digest
+        compressed_file = artifact.compressed_file
+        assert compressed_file.startswith(str(tmp_path))
+        del artifact
+        assert os.path.exists(compressed_file)
+
+        # Artifacts are found based on the URL or the digest stated.
+        assert Artifact(self._WHEEL, url).gather_hashes() == Artifact(self._WHEEL, "", sha=digest).gather_hashes()
+
+    def test_keep_given_file(self, tmp_path):
+        """Test files passed by the caller are not removed."""
+        wheel = str(tmp_path / self._WHEEL)
+        shutil.copy(os.path.join(self.data_dir, self._WHEEL), wheel)
+        artifact = Artifact(self._WHEEL, "", wheel)
+        artifact.gather_hashes(in_archive=False)
+        dir_name = artifact.dir_name
+        del artifact
+        assert os.path.exists(wheel)
+        assert not os.path.exists(dir_name)
+
+    def _serve_ranges(self, content, requested_ranges, support_ranges=True):
+        """Mock the shared session to serve the given content, record ranges requested."""
+
+        def get(url, verify, headers=None, stream=False):
+            response = flexmock(
+                status_code=200, headers={}, content=content, close=lambda: None, raise_for_status=lambda: None
+            )
+            response.iter_content = lambda chunk_size: [content]
+            range_header = (headers or {}).get("Range")
+            if range_header is None or not support_ranges:
+                return response
+
+            start, end = range_header[len("bytes=") :].split("-")
+            if not start:
+                start, end = max(len(content) - int(end), 0), len(content) - 1
+            start, end = int(start), min(int(end), len(content) - 1)
+            requested_ranges.append((start, end))
+            response.status_code = 206
+            response.headers = {"Content-Range": f"bytes {start}-{end}/{len(content)}"}
+            response.content = content[start : end + 1]
+            return response
+
+        flexmock(get_session()).should_receive("get").replace_with(get)
+
+    def test_remote_members(self):
+        """Test listing and reading files of a wheel using Range requests."""
+        # Make the wheel big enough not to fit into the initial tail request.
+        with zipfile.ZipFile(os.path.join(self.data_dir, self._WHEEL)) as zip_ref:
+            big_wheel = io.BytesIO()
+            with zipfile.ZipFile(big_wheel, "w") as big_zip_ref:
+                big_zip_ref.writestr("tensorflow_serving/big.bin", os.urandom(1024 * 1024))
+                for info in zip_ref.infolist():
+                    big_zip_ref.writestr(info, zip_ref.read(info))
+        content = big_wheel.getvalue()
+
+        requested_ranges = []
+        self._serve_ranges(content, requested_ranges)
+
+        artifact = Artifact(self._WHEEL, f"https://example.com/{self._WHEEL}")
+        members = artifact.list_members()
+        assert "tensorflow_serving_api-1.13.0.dist-info/RECORD" in members
+        assert "tensorflow_serving/big.bin" in members
+        record = artifact.read_member("tensorflow_serving_api-1.13.0.dist-info/RECORD")
+        assert b"tensorflow_serving/__init__.py" in record
+
+        assert artifact.compressed_file is None
+        assert sum(end - start + 1 for start, end in requested_ranges) < len(content) / 2
+
+        with zipfile.ZipFile(big_wheel) as zip_ref:
+            assert artifact.read_member("tensorflow_serving/big.bin") == zip_ref.read("tensorflow_serving/big.bin")
+
+    def test_remote_members_not_supported(self):
+        """Test the artifact is downloaded if the server does not support Range requests."""
+        with open(os.path.join(self.data_dir, self._WHEEL), "rb") as f:
+            content = f.read()
+
+        self._serve_ranges(content, [], support_ranges=False)
+        artifact = Artifact(self._WHEEL, f"https://example.com/{self._WHEEL}")
+        with zipfile.ZipFile(os.path.join(self.data_dir, self._WHEEL)) as zip_ref:
+            assert artifact.list_members() == [info.filename for info in zip_ref.infolist() if not info.is_dir()]
+
+        assert artifact.compressed_file is not None
+
+    def test_remote_members_tarball(self):
+        """Test a tarball served by a server supporting Range requests is downloaded to be read."""
+        sdist = io.BytesIO()
+        with tarfile.open(fileobj=sdist, mode="w:gz") as tf:
+            for name, data in (
+                ("selinon-1.0.0/PKG-INFO", b"Metadata-Version: 2.1\nName: selinon\n"),
+                ("selinon-1.0.0/setup.py", b""),
+            ):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+        self._serve_ranges(sdist.getvalue(), [])
+        artifact = Artifact("selinon-1.0.0.tar.gz", "https://example.com/selinon-1.0.0.tar.gz")
+        assert artifact.list_members() == ["selinon-1.0.0/PKG-INFO", "selinon-1.0.0/setup.py"]
+        assert artifact.read_metadata() == b"Metadata-Version: 2.1\nName: selinon\n"
+        assert artifact.compressed_file is not None
+
+    def test_read_metadata(self):
+        """Test reading core metadata of a wheel."""
+        artifact = Artifact(self._WHEEL, "", os.path.join(self.data_dir, self._WHEEL))
+        assert artifact.read_metadata().startswith(b"Metadata-Version:")
+
+    def test_gather_hashes_in_archive(self):
+        """Test hashing files streamed from a wheel gives the same results as hashing extracted files."""
+        with open(os.path.join(self.data_dir, "tensorflow_serving_api-1.13.0-py2.py3-f29-any.json")) as json_file:
+            expected = json.load(json_file)
+
+        artifact = Artifact(self._WHEEL, "", os.path.join(self.data_dir, self._WHEEL))
+        in_archive = artifact.gather_hashes()
+        extracted = artifact.gather_hashes(in_archive=False)
+
+        def key(hashes):
+            return sorted(tuple(item.items()) for item in hashes)
+
+        assert key(in_archive) == key(expected)
+        assert key(extracted) == key(expected)
+
+    def test_gather_hashes_max_workers(self):
+        """Test hashing files in parallel gives the same results in the same order as hashing sequentially."""
+        artifact = Artifact(self._WHEEL, "", os.path.join(self.data_dir, self._WHEEL))
+        assert artifact.gather_hashes(max_workers=4) == artifact.gather_hashes()
+        assert artifact.gather_hashes(in_archive=False, max_workers=4) == artifact.gather_hashes(in_archive=False)
+
+    def _create_recorded_wheel(self):
+        """Create a wheel with RECORD file matching its content, METADATA of the test wheel was altered."""
+        wheel = io.BytesIO()
+        with zipfile.ZipFile(os.path.join(self.data_dir, self._WHEEL)) as zip_ref:
+            with zipfile.ZipFile(wheel, "w") as wheel_zip_ref:
+                record = []
+                for info in zip_ref.infolist():
+                    if info.filename.endswith("/RECORD"):
+                        record_path = info.filename
+                        continue
+                    data = zip_ref.read(info)
+                    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+                    record.append(f"{info.filename},sha256={digest},{len(data)}\n")
+                    wheel_zip_ref.writestr(info, data)
+                record.append(f"{record_path},,\n")
+                wheel_zip_ref.writestr(record_path, "".join(record))
+
+        return wheel.getvalue()
+
+    def test_gather_hashes_record(self):
+        """Test digests taken from RECORD file match digests computed."""
+        self._serve_ranges(self._create_recorded_wheel(), [])
+        artifact = Artifact(self._WHEEL, f"https://example.com/{self._WHEEL}")
+        from_record = artifact.gather_hashes(use_record=True, record_sample_size=3)
+        # The wheel was read remotely.
+        assert artifact.compressed_file is None
+        assert from_record == artifact.gather_hashes()
+
+    def test_gather_hashes_record_result_store(self, tmp_path, monkeypatch):
+        """Test the wheel is read remotely if the result store is configured and the digest is not known."""
+        monkeypatch.setattr(config, "result_store_path", str(tmp_path / "results.db"))
+        self._serve_ranges(self._create_recorded_wheel(), [])
+        artifact = Artifact(self._WHEEL, f"https://example.com/{self._WHEEL}")
+        assert artifact.gather_hashes(use_record=True)
+        assert artifact.compressed_file is None
+
+    def test_gather_hashes_record_mismatch(self, tmp_path):
+        """Test all files are hashed if RECORD file does not match content of the wheel."""
+        wheel = str(tmp_path / self._WHEEL)
+        with zipfile.ZipFile(os.path.join(self.data_dir, self._WHEEL)) as zip_ref:
+            with zipfile.ZipFile(wheel, "w") as tampered_zip_ref:
+                for info in zip_ref.infolist():
+                    data = zip_ref.read(info)
+                    if info.filename.endswith(".py"):
+                        data += b"# tampered"
+                    tampered_zip_ref.writestr(info, data)
+
+        artifact = Artifact(self._WHEEL, "", wheel)
+        assert artifact.gather_hashes(use_record=True, record_sample_size=1000) == artifact.gather_hashes()
+        assert artifact.gather_hashes(use_record=True) != artifact.gather_hashes()
+
+    def test_gather_hashes_tarball(self, tmp_path):
+        """Test hashing files streamed from a tarball, including links."""
+        source_dir = tmp_path / "selinon-1.0.0"
+        source_dir.mkdir()
+        (source_dir / "setup.py").write_bytes(b"from setuptools import setup")
+        (source_dir / "README").write_bytes(b"Selinon")
+        os.symlink("README", str(source_dir / "README.rst"))
+
+        tarball = str(tmp_path / "selinon-1.0.0.tar.gz")
+        with tarfile.open(tarball, "w:gz") as tf:
+            tf.add(str(source_dir), arcname="selinon-1.0.0")
+
+        artifact = Artifact("selinon-1.0.0.tar.gz", "", tarball)
+        assert sorted(artifact.gather_hashes(), key=lambda item: item["filepath"]) == [
+            {"filepath": "selinon-1.0.0/README", "sha256": hashlib.sha256(b"Selinon").hexdigest()},
+            {"filepath": "selinon-1.0.0/README.rst", "sha256": hashlib.sha256(b"Selinon").hexdigest()},
+            {
+                "filepath": "selinon-1.0.0/setup.py",
+                "sha256": hashlib.sha256(b"from setuptools import setup").hexdigest(),
+            },
+        ]
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Python interpreter is used as an ELF object")
+    def test_get_versioned_symbols(self, tmp_path):
+        """Test only ELF objects are inspected for versioned symbols."""
+        wheel = str(tmp_path / "selinon-1.0.0-cp38-cp38-linux_x86_64.whl")
+        with zipfile.ZipFile(wheel, "w") as zip_ref:
+            zip_ref.write(sys.executable, "selinon/_native.so")
+            zip_ref.writestr("selinon/__init__.py", b"\x7fELF but not really")
+            zip_ref.writestr("selinon/data.bin", b"not an ELF object")
+            zip_ref.writestr("selinon-1.0.0.dist-info/RECORD", b"")
+
+        artifact = Artifact(os.path.basename(wheel), "", wheel)
+        assert artifact._may_be_elf("selinon/_native.so")
+        assert not artifact._may_be_elf("selinon/__init__.py")
+        assert not artifact._may_be_elf("selinon-1.0.0.dist-info/RECORD")
+
+        symbols = artifact.get_versioned_symbols()
+        assert "libc.so.6" in symbols
+
+        assert symbols == artifact.get_versioned_symbols(in_archive=False)
+        assert symbols == artifact.get_versioned_symbols(max_workers=2)
+        assert symbols == artifact.get_versioned_symbols(in_archive=False, max_workers=2)
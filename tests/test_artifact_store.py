@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Tests for the content-addressed artifact store."""
+
+import hashlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+from thoth.python import artifact_store
+from thoth.python.artifact_store import ArtifactStore
+from thoth.python.exceptions import UnsupportedConfigurationError
+
+from .base import PythonTestCase
+
+
+def _add(store, content, url=None):
+    with store.temporary_file() as f:
+        f.write(content)
+    with store.add(f.name, hashlib.sha256(content).hexdigest(), url=url) as stored:
+        return stored.name
+
+
+class TestArtifactStore(PythonTestCase):
+    """Test the content-addressed artifact store."""
+
+    def test_add_get(self, tmp_path):
+        """Test artifacts are stored by their digest and URLs are mapped to digests."""
+        store = ArtifactStore(str(tmp_path))
+        digest = hashlib.sha256(b"selinon").hexdigest()
+        assert store.get(digest) is None
+        assert store.get_digest("https://example.com/selinon-1.0.0.tar.gz") is None
+
+        path = _add(store, b"selinon", url="https://example.com/selinon-1.0.0.tar.gz")
+        with store.get(digest) as stored:
+            assert stored.name == path
+        assert store.get_digest("https://example.com/selinon-1.0.0.tar.gz") == digest
+        with open(path, "rb") as f:
+            assert f.read() == b"selinon"
+
+        assert os.listdir(str(tmp_path / "tmp")) == []
+
+    def test_evict(self, tmp_path):
+        """Test least recently used artifacts are evicted to fit into the size limit."""
+        store = ArtifactStore(str(tmp_path), max_bytes=20)
+        first = _add(store, b"a" * 8)
+        os.utime(first, (1, 1))
+        second = _add(store, b"b" * 8)
+        os.utime(second, (2, 2))
+        # Accessing the first artifact makes it the most recently used one.
+        store.get(hashlib.sha256(b"a" * 8).hexdigest()).close()
+
+        third = _add(store, b"c" * 8)
+        assert os.path.exists(first)
+        assert not os.path.exists(second)
+        assert os.path.exists(third)
+
+    def test_evict_in_use(self, tmp_path):
+        """Test artifacts in use are not evicted, also if used by another process."""
+        store = ArtifactStore(str(tmp_path), max_bytes=10)
+        first = _add(store, b"a" * 8)
+        os.utime(first, (1, 1))
+        stored = store.get(hashlib.sha256(b"a" * 8).hexdigest())
+        os.utime(first, (1, 1))
+
+        pid = os.fork()
+        if pid == 0:
+            # Another process adding an artifact cannot evict the artifact in use.
+            _add(ArtifactStore(str(tmp_path), max_bytes=10), b"b" * 8)
+            os._exit(0 if os.path.exists(first) else 1)
+
+        _, status = os.waitpid(pid, 0)
+        assert status == 0
+        with open(first, "rb") as f:
+            assert f.read() == b"a" * 8
+
+        stored.close()
+        assert store.evict() == 1
+        assert not os.path.exists(first)
+        assert store.get(hashlib.sha256(b"a" * 8).hexdigest()) is None
+
+    def test_add_stored(self, tmp_path):
+        """Test adding an artifact already stored keeps the stored one."""
+        store = ArtifactStore(str(tmp_path))
+        path = _add(store, b"selinon")
+        with store.get(hashlib.sha256(b"selinon").hexdigest()) as stored:
+            inode = os.fstat(stored.fileno()).st_ino
+            assert _add(store, b"selinon") == path
+            assert os.stat(path).st_ino == inode
+
+        assert os.listdir(str(tmp_path / "tmp")) == []
+
+    def test_no_file_locking(self, tmp_path, monkeypatch):
+        """Test the package is usable without file locking, the artifact store cannot be configured then."""
+        code = (
+            "import importlib, sys; import thoth.python.artifact_store as module; "
+            "sys.modules['fcntl'] = None; importlib.reload(module)"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+        monkeypatch.setattr(artifact_store, "fcntl", None)
+        with pytest.raises(UnsupportedConfigurationError):
+            ArtifactStore(str(tmp_path))
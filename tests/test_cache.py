@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Tests for the in-process cache of index queries."""
+
+import asyncio
+import time
+
+import pytest
+from flexmock import flexmock
+
+from thoth.python.cache import Cache
+from thoth.python.cache import CacheKey
+from thoth.python.cache import cache
+from thoth.python.source import Source
+
+from .base import PythonTestCase
+
+
+def _key(package_name, source_url="https://pypi.org/simple"):
+    return CacheKey(source_url, (), package_name, "get_package_versions", (package_name,))
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCache(PythonTestCase):
+    """Test the in-process cache of index queries."""
+
+    def test_hit_miss(self):
+        """Test values are computed once and statistics are kept."""
+        c = Cache(max_bytes=1024 * 1024)
+        assert c.get_or_compute(_key("selinon"), lambda: ["1.0.0"]) == ["1.0.0"]
+        assert c.get_or_compute(_key("selinon"), lambda: ["2.0.0"]) == ["1.0.0"]
+        assert c.statistics.hits == 1
+        assert c.statistics.misses == 1
+
+    def test_max_bytes(self):
+        """Test least recently used entries are evicted to fit into the memory limit."""
+        value = ["x" * 1000]
+        c = Cache(max_bytes=3000)
+        c.get_or_compute(_key("a"), lambda: list(value))
+        c.get_or_compute(_key("b"), lambda: list(value))
+        c.get_or_compute(_key("a"), lambda: list(value))
+        c.get_or_compute(_key("c"), lambda: list(value))
+        assert c.size <= 3000
+        assert c.statistics.evictions == 1
+        assert c.get_or_compute(_key("a"), lambda: None) == value
+        assert c.get_or_compute(_key("b"), lambda: None) is None
+
+    def test_ttl(self):
+        """Test entries expire."""
+        clock = _Clock()
+        c = Cache(max_bytes=1024 * 1024, ttl=10, clock=clock)
+        c.get_or_compute(_key("selinon"), lambda: ["1.0.0"])
+        clock.now = 11
+        assert c.get_or_compute(_key("selinon"), lambda: ["2.0.0"]) == ["2.0.0"]
+        assert c.statistics.expirations == 1
+
+    def test_stale_while_revalidate(self):
+        """Test stale entries are served while refreshed in background."""
+        clock = _Clock()
+        c = Cache(max_bytes=1024 * 1024, ttl=10, stale_while_revalidate=10, clock=clock)
+        c.get_or_compute(_key("selinon"), lambda: ["1.0.0"])
+        clock.now = 15
+        assert c.get_or_compute(_key("selinon"), lambda: ["2.0.0"]) == ["1.0.0"]
+        assert c.statistics.stale_hits == 1
+
+        for _ in range(100):
+            if c.get_or_compute(_key("selinon"), lambda: None) == ["2.0.0"]:
+                break
+            time.sleep(0.01)
+        else:
+            raise AssertionError("Cache entry was not refreshed")
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self):
+        """Test concurrent requests for the same key are coalesced into a single computation."""
+        c = Cache(max_bytes=1024 * 1024)
+        calls = []
+
+        async def compute():
+            calls.append(None)
+            await asyncio.sleep(0.01)
+            return ("1.0.0",)
+
+        results = await asyncio.gather(*(c.get_or_compute_async(_key("selinon"), compute) for _ in range(100)))
+        assert results == [("1.0.0",)] * 100
+        assert len(calls) == 1
+        assert c.statistics.coalesced == 99
+        assert await c.get_or_compute_async(_key("selinon"), compute) == ("1.0.0",)
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_single_flight_error(self):
+        """Test errors are propagated to all the coalesced requests and are not cached."""
+        c = Cache(max_bytes=1024 * 1024)
+        calls = []
+
+        async def compute():
+            calls.append(None)
+            await asyncio.sleep(0.01)
+            raise ValueError("failure")
+
+        results = await asyncio.gather(
+            *(c.get_or_compute_async(_key("selinon"), compute) for _ in range(10)), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(calls) == 1
+        assert len(c) == 0
+
+    @pytest.mark.asyncio
+    async def test_single_flight_cancelled(self):
+        """Test cancellation of the computing request does not cancel the coalesced requests."""
+        c = Cache(max_bytes=1024 * 1024)
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            return ("1.0.0",)
+
+        first = asyncio.ensure_future(c.get_or_compute_async(_key("selinon"), compute))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(c.get_or_compute_async(_key("selinon"), compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == ("1.0.0",)
+        assert first.cancelled()
+
+    def test_invalidate(self):
+        """Test invalidation per source and per package."""
+        c = Cache(max_bytes=1024 * 1024)
+        c.get_or_compute(_key("selinon"), lambda: ["1.0.0"])
+        c.get_or_compute(_key("thoth"), lambda: ["1.0.0"])
+        c.get_or_compute(_key("selinon", "https://example.com/simple"), lambda: ["1.0.0"])
+        assert c.invalidate(package_name="selinon") == 2
+        assert c.invalidate(source_url="https://pypi.org/simple") == 1
+        assert len(c) == 0
+
+    def test_source_cache(self):
+        """Test results of source queries are cached and can be invalidated."""
+        source = Source("https://pypi.org/simple", warehouse=True)
+        flexmock(Source).should_receive("_warehouse_get_api_package_info").with_args("selinon").and_return(
+            {"releases": {"1.0.0": []}}
+        ).twice()
+
+        assert source.get_package_versions("selinon") == ["1.0.0"]
+        assert source.get_package_versions("selinon") == ["1.0.0"]
+        assert source.invalidate_cache("Selinon") == 2
+        assert source.get_package_versions("selinon") == ["1.0.0"]
+        assert cache.invalidate(source_url=source.url) == 2
+
+    def test_source_cache_positional_arguments(self):
+        """Test arguments other than package names passed positionally are part of the key."""
+        source = Source("https://example.com/simple", warehouse=False)
+        flexmock(Source).should_receive("iter_packages").replace_with(lambda: iter(["selinon"])).twice()
+
+        assert "selinon" in source.get_packages(True)
+        assert source.get_packages(False) == {"selinon"}
+        assert source.get_packages(False) == {"selinon"}
+        assert source.invalidate_cache() == 2
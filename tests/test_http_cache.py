@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Tests for the on-disk HTTP revalidation cache."""
+
+from flexmock import flexmock
+
+from thoth.python.http_cache import HTTPCache
+from thoth.python.session import get_session
+
+from .base import PythonTestCase
+
+
+class _Response:
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+
+
+class TestHTTPCache(PythonTestCase):
+    """Test the on-disk HTTP revalidation cache."""
+
+    _URL = "https://pypi.org/simple/selinon"
+
+    def test_revalidate(self, tmp_path):
+        """Test a not modified response is served from the cache without parsing."""
+        cache = HTTPCache(str(tmp_path))
+
+        flexmock(get_session()).should_receive("get").with_args(self._URL, verify=True, headers={}).and_return(
+            _Response(200, {"ETag": '"abc"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}, ["selinon"])
+        ).once()
+        assert cache.get(self._URL, kind="test", parse=lambda r: r.body) == ["selinon"]
+
+        flexmock(get_session()).should_receive("get").with_args(
+            self._URL,
+            verify=True,
+            headers={"If-None-Match": '"abc"', "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+        ).and_return(_Response(304)).once()
+
+        def parse(_):
+            raise AssertionError("Response should not be parsed")
+
+        assert cache.get(self._URL, kind="test", parse=parse) == ["selinon"]
+
+    def test_modified(self, tmp_path):
+        """Test a changed response replaces the cached one."""
+        cache = HTTPCache(str(tmp_path))
+
+        flexmock(get_session()).should_receive("get").and_return(
+            _Response(200, {"ETag": '"abc"'}, ["selinon"])
+        ).and_return(_Response(200, {"ETag": '"def"'}, ["selinon", "thoth"]))
+        assert cache.get(self._URL, kind="test", parse=lambda r: r.body) == ["selinon"]
+        assert cache.get(self._URL, kind="test", parse=lambda r: r.body) == ["selinon", "thoth"]
+        entry = cache._load_entry(cache._entry_path("test", self._URL))
+        assert entry["etag"] == '"def"'
+        assert entry["data"] == ["selinon", "thoth"]
+
+    def test_no_validators(self, tmp_path):
+        """Test responses without validators are not cached."""
+        cache = HTTPCache(str(tmp_path))
+
+        flexmock(get_session()).should_receive("get").and_return(_Response(200, {}, ["selinon"]))
+        assert cache.get(self._URL, kind="test", parse=lambda r: r.body) == ["selinon"]
+        assert cache._load_entry(cache._entry_path("test", self._URL)) is None
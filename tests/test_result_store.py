@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Tests for the persistent store of artifact analyses results."""
+
+import os
+
+import pytest
+from flexmock import flexmock
+
+from thoth.python.artifact import Artifact
+from thoth.python.configuration import config
+from thoth.python.exceptions import ArtifactDigestMismatchError
+from thoth.python.session import get_session
+from thoth.python.result_store import ResultStore
+
+from .base import PythonTestCase
+
+
+class TestResultStore(PythonTestCase):
+    """Test the persistent store of artifact analyses results."""
+
+    _WHEEL = "tensorflow_serving_api-1.13.0-py2.py3-f29-any.whl"
+
+    def test_put_get(self, tmp_path):
+        """Test results are stored by artifact digest and kind."""
+        store = ResultStore(str(tmp_path / "results.db"))
+        assert store.get("abc", "hashes") is None
+
+        store.put("abc", "hashes", [{"filepath": "selinon/__init__.py", "sha256": "def"}])
+        assert store.get("abc", "hashes") == [{"filepath": "selinon/__init__.py", "sha256": "def"}]
+        assert store.get("abc", "symbols") is None
+
+        # Results are persisted across store instances.
+        assert ResultStore(str(tmp_path / "results.db")).get("abc", "hashes") is not None
+
+    def test_artifact_results_stored(self, tmp_path, monkeypatch):
+        """Test artifact analyses are not computed again for an artifact with the same digest."""
+        monkeypatch.setattr(config, "result_store_path", str(tmp_path / "results.db"))
+
+        artifact = Artifact(self._WHEEL, "", os.path.join(self.data_dir, self._WHEEL))
+        hashes = artifact.gather_hashes()
+        symbols = artifact.get_versioned_symbols()
+
+        artifact = Artifact(self._WHEEL, "", os.path.join(self.data_dir, self._WHEEL), sha=artifact.sha)
+        flexmock(Artifact).should_receive("_compute_hashes").never()
+        flexmock(Artifact).should_receive("_compute_versioned_symbols").never()
+        assert artifact.gather_hashes() == hashes
+        assert artifact.get_versioned_symbols() == symbols
+
+    def test_digest_mismatch_not_stored(self, tmp_path, monkeypatch):
+        """Test results are not computed nor stored for artifacts not matching the digest stated."""
+        monkeypatch.setattr(config, "result_store_path", str(tmp_path / "results.db"))
+        with open(os.path.join(self.data_dir, self._WHEEL), "rb") as f:
+            content = f.read()
+
+        response = flexmock(
+            raise_for_status=lambda: None, iter_content=lambda chunk_size: [content], close=lambda: None
+        )
+        flexmock(get_session()).should_receive("get").and_return(response)
+
+        artifact = Artifact(self._WHEEL, f"https://example.com/{self._WHEEL}", sha="0" * 64)
+        with pytest.raises(ArtifactDigestMismatchError):
+            artifact.gather_hashes(in_archive=False)
+        assert artifact.compressed_file is None
+
+        # Results computed from content with a digest not verified are not stored either.
+        artifact = Artifact(self._WHEEL, "", os.path.join(self.data_dir, self._WHEEL), sha="0" * 64)
+        assert artifact.gather_hashes()
+        assert ResultStore(str(tmp_path / "results.db")).get("0" * 64, "hashes") is None
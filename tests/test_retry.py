@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Tests for retries of requests failing on transient errors."""
+
+import io
+import ssl
+import time
+from email.utils import formatdate
+
+import aiohttp
+import pytest
+import requests
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from flexmock import flexmock
+
+from thoth.python.aiosource import AIOSource
+from thoth.python.retry import RetryPolicy
+from thoth.python.retry import retry_policy
+from thoth.python.session import _RetryingSession
+
+from .base import PythonTestCase
+
+
+def _response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(b"")
+    response.headers.update(headers or {})
+    return response
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRetry(PythonTestCase):
+    """Test retries of requests failing on transient errors."""
+
+    @pytest.fixture(autouse=True)
+    def _no_backoff(self, monkeypatch):
+        """Do not wait between retries of the shared policy."""
+        monkeypatch.setattr(retry_policy, "backoff_factor", 0)
+        retry_policy.reset_statistics()
+
+    def test_get_delay(self):
+        """Test computing delays between retries."""
+        clock = _Clock()
+        policy = RetryPolicy(max_retries=3, backoff_factor=1, max_backoff=3, budget=10, clock=clock)
+        assert 0 <= policy.get_delay(0, 0) <= 1
+        assert 0 <= policy.get_delay(2, 0) <= 3
+        assert policy.get_delay(3, 0) is None
+        assert policy.get_delay(0, 0, "5") == 5
+        assert policy.get_delay(0, 0, "11") is None
+        assert 0 <= policy.get_delay(0, 0, "invalid") <= 1
+        clock.now = 9.5
+        assert policy.get_delay(0, 0, "1") is None
+
+    def test_retry_after_date(self):
+        """Test Retry-After stating an HTTP date."""
+        assert 1 <= RetryPolicy._parse_retry_after(formatdate(time.time() + 5, usegmt=True)) <= 5
+        assert RetryPolicy._parse_retry_after(formatdate(time.time() - 5, usegmt=True)) == 0
+
+    def test_session_retry(self):
+        """Test idempotent requests done using the shared session are retried."""
+        outcomes = [requests.ConnectionError("reset"), _response(503, {"Retry-After": "0"}), _response(200)]
+
+        def request(*args, **kwargs):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        flexmock(requests.Session).should_receive("request").replace_with(request).times(3)
+
+        response = _RetryingSession().get("https://example.com/simple")
+        assert response.status_code == 200
+        assert retry_policy.statistics.retries == 2
+        assert retry_policy.statistics.error_retries == 1
+        assert retry_policy.statistics.status_retries == 1
+
+    def test_session_retry_exhausted(self, monkeypatch):
+        """Test the last response is returned once retries are exhausted and other methods are not retried."""
+        monkeypatch.setattr(retry_policy, "max_retries", 2)
+        flexmock(requests.Session).should_receive("request").and_return(_response(502)).times(4)
+
+        assert _RetryingSession().get("https://example.com/simple").status_code == 502
+        assert retry_policy.statistics.retries == 2
+        assert retry_policy.statistics.exhausted == 1
+        assert _RetryingSession().post("https://example.com/simple").status_code == 502
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            requests.exceptions.SSLError("certificate verify failed"),
+            requests.exceptions.InvalidURL("invalid"),
+            requests.exceptions.InvalidSchema("invalid"),
+        ],
+    )
+    def test_permanent_error(self, error):
+        """Test TLS errors and invalid URLs are raised without retries."""
+        flexmock(requests.Session).should_receive("request").and_raise(error).once()
+
+        with pytest.raises(type(error)):
+            _RetryingSession().get("https://example.com/simple")
+        assert retry_policy.statistics.retries == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error",
+        [
+            aiohttp.ClientSSLError(flexmock(host="example.com", port=443, ssl=True), OSError("bad record")),
+            aiohttp.ClientConnectorCertificateError(
+                flexmock(host="example.com", port=443, ssl=True), ssl.SSLCertVerificationError("expired")
+            ),
+            aiohttp.InvalidURL("invalid"),
+        ],
+    )
+    async def test_permanent_error_async(self, error):
+        """Test TLS errors and invalid URLs are raised without retries by aiohttp based requests."""
+        calls = []
+
+        async def request():
+            calls.append(None)
+            raise error
+
+        with pytest.raises(type(error)):
+            await retry_policy.call_async("https://example.com/simple", request)
+        assert len(calls) == 1
+        assert retry_policy.statistics.retries == 0
+
+    @pytest.mark.asyncio
+    async def test_aiosource_retry(self):
+        """Test requests done by AIOSource are retried."""
+        statuses = [429, 503]
+
+        async def handler(request):
+            if statuses:
+                return web.Response(status=statuses.pop(0), headers={"Retry-After": "0"})
+
+            return web.Response(
+                text='<a href="selinon-1.0.0.tar.gz">selinon-1.0.0.tar.gz</a>', content_type="text/html"
+            )
+
+        app = web.Application()
+        app.router.add_get("/simple/selinon", handler)
+        async with TestServer(app) as server:
+            async with AIOSource(str(server.make_url("/simple")), warehouse=False) as source:
+                assert await source._simple_repository_list_versions("selinon") == ["1.0.0"]
+
+        assert retry_policy.statistics.status_retries == 2
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+# type: ignore
+
+"""Tests for the shared HTTP session."""
+
+from thoth.python.configuration import config
+from thoth.python.session import close_session
+from thoth.python.session import get_session
+
+from .base import PythonTestCase
+
+
+class TestSession(PythonTestCase):
+    """Test the shared HTTP session."""
+
+    def test_get_session_shared(self):
+        """Test the same session is returned on subsequent calls."""
+        assert get_session() is get_session()
+
+    def test_close_session(self):
+        """Test closing the session makes a new session to be created."""
+        session = get_session()
+        close_session()
+        assert get_session() is not session
+
+    def test_pool_maxsize_per_host(self, monkeypatch):
+        """Test host specific connection pools are mounted."""
+        close_session()
+        monkeypatch.setattr(config, "http_pool_maxsize_per_host", {"pypi.org": 42})
+        try:
+            session = get_session()
+            adapter = session.get_adapter("https://pypi.org/simple/selinon/")
+            assert adapter._pool_maxsize == 42
+            assert session.get_adapter("https://files.pythonhosted.org/packages/") is not adapter
+        finally:
+            close_session()
@@ -18,16 +18,23 @@
 
 """Tests for package index handling - package source control."""
 
+import asyncio
+import hashlib
 import os
 import json
 from pathlib import Path
 
 import pytest
-import requests
+from aiohttp.test_utils import TestServer
 from flexmock import flexmock
 
 from thoth.python.source import Source
+from thoth.python.source import SIMPLE_API_ACCEPT
 from thoth.python.artifact import Artifact
+from thoth.python.digests_fetcher import PythonDigestsFetcher
+from thoth.python.exceptions import NotFoundError
+from thoth.python.compact_set import CompactPackageSet
+from thoth.python.session import get_session
 
 from .base import PythonTestCase
 
@@ -134,18 +141,35 @@ class TestSource(PythonTestCase):
         source_info = {"name": "my-pypi", "url": "https://pypi.org/simple", "verify_ssl": True, "warehouse": True}
 
         class Response:
-            text = (Path(self.data_dir) / "simple.html").read_text()
+            content = (Path(self.data_dir) / "simple.html").read_bytes()
 
             @staticmethod
             def raise_for_status():
                 pass
 
-        flexmock(requests).should_receive("get").with_args(
-            source_info["url"], verify=source_info["verify_ssl"]
+            @classmethod
+            def iter_content(cls, chunk_size):
+                # Use small chunks so that links are split across chunk boundaries.
+                for idx in range(0, len(cls.content), 7):
+                    yield cls.content[idx : idx + 7]
+
+            @staticmethod
+            def close():
+                pass
+
+        flexmock(get_session()).should_receive("get").with_args(
+            source_info["url"], verify=source_info["verify_ssl"], stream=True
         ).and_return(Response)
 
         source = Source.from_dict(source_info)
-        assert source.get_packages() == {
+        packages = source.get_packages()
+        assert isinstance(packages, set)
+        compact_packages = source.get_packages(compact=True)
+        assert isinstance(compact_packages, CompactPackageSet)
+        assert "selinon" in compact_packages
+        assert "selinonlib" not in compact_packages
+        assert packages == compact_packages
+        assert packages == {
             "selinon",
             "thoth",
             "thoth-adviser",
@@ -175,8 +199,8 @@ class TestSource(PythonTestCase):
                 with open(os.path.join(self.data_dir, "selinon-warehouse-api.json")) as json_file:
                     return json.load(json_file)
 
-        flexmock(requests).should_receive("get").with_args(
-            "https://pypi.org/pypi/selinon/json", verify=source_info["verify_ssl"]
+        flexmock(get_session()).should_receive("get").with_args(
+            "https://pypi.org/pypi/selinon/json", verify=source_info["verify_ssl"], headers=None
         ).and_return(Response)
 
         source = Source.from_dict(source_info)
@@ -196,6 +220,34 @@ class TestSource(PythonTestCase):
             "1.0.0rc4",
         }
 
+    def test_warehouse_package_info_reused(self):
+        """Test versions and hashes of all releases are answered from one Warehouse API document."""
+        source = Source("https://pypi.org/simple", warehouse=True)
+
+        with open(os.path.join(self.data_dir, "selinon-warehouse-api.json")) as json_file:
+            package_info = json.load(json_file)
+
+        flexmock(Source).should_receive("_warehouse_get_api_package_info").with_args("selinon").and_return(
+            package_info
+        ).once()
+        flexmock(Source).should_receive("_warehouse_get_api_package_version_info").never()
+
+        assert "1.0.0" in source.get_package_versions("selinon")
+        assert source.get_package_hashes("selinon", "1.0.0") == [
+            {
+                "name": "selinon-1.0.0-py3-none-any.whl",
+                "sha256": "9a62e16ea9dc730d006e1271231f318ee2dad48d145fd3b9e902a925ea3cca2e",
+            },
+            {
+                "name": "selinon-1.0.0.tar.gz",
+                "sha256": "392ab7d2ff1430417a50327515538cec3e9f302b7513dc8e8474745a1b28187a",
+            },
+        ]
+        assert [item["name"] for item in source.get_package_hashes("selinon", "1.0.0rc4")] == [
+            "selinon-1.0.0rc4-py3-none-any.whl",
+            "selinon-1.0.0rc4.tar.gz",
+        ]
+
     def test_get_package_versions_simple(self):
         """Test get package versions simple."""
         source_info = {"name": "my-pypi", "url": "https://pypi.org/simple", "verify_ssl": True, "warehouse": False}
@@ -203,13 +255,14 @@ class TestSource(PythonTestCase):
         class Response:
             text = (Path(self.data_dir) / "tensorflow.html").read_text()
             status_code = 200
+            headers = {"Content-Type": "text/html"}
 
             @staticmethod
             def raise_for_status():
                 pass
 
-        flexmock(requests).should_receive("get").with_args(
-            source_info["url"] + "/tensorflow", verify=source_info["verify_ssl"]
+        flexmock(get_session()).should_receive("get").with_args(
+            source_info["url"] + "/tensorflow", verify=source_info["verify_ssl"], headers={"Accept": SIMPLE_API_ACCEPT}
         ).and_return(Response)
 
         source = Source.from_dict(source_info)
@@ -233,6 +286,212 @@ class TestSource(PythonTestCase):
             "1.2.0rc0",
         }
 
+    def test_simple_repository_json(self):
+        """Test parsing artifacts listed by JSON based simple repository API."""
+        source_info = {"name": "my-pypi", "url": "https://pypi.org/simple", "verify_ssl": True, "warehouse": False}
+
+        class Response:
+            text = (Path(self.data_dir) / "selinon-simple.json").read_text()
+            status_code = 200
+            headers = {"Content-Type": "application/vnd.pypi.simple.v1+json"}
+
+            @staticmethod
+            def raise_for_status():
+                pass
+
+        flexmock(get_session()).should_receive("get").with_args(
+            source_info["url"] + "/selinon", verify=source_info["verify_ssl"], headers={"Accept": SIMPLE_API_ACCEPT}
+        ).and_return(Response)
+
+        source = Source.from_dict(source_info)
+        assert source._simple_repository_list_artifact_links("selinon") == [
+            {
+                "name": "selinon-1.0.0-py3-none-any.whl",
+                "url": "https://files.pythonhosted.org/packages/a2/07/selinon-1.0.0-py3-none-any.whl"
+                "#sha256=9a62e16ea9dc730d006e1271231f318ee2dad48d145fd3b9e902a925ea3cca2e",
+                "sha256": "9a62e16ea9dc730d006e1271231f318ee2dad48d145fd3b9e902a925ea3cca2e",
+                "requires_python": None,
+                "yanked": False,
+                "core_metadata": {},
+            },
+            {
+                "name": "selinon-1.0.0.tar.gz",
+                "url": "https://files.pythonhosted.org/packages/7a/34/selinon-1.0.0.tar.gz"
+                "#sha256=392ab7d2ff1430417a50327515538cec3e9f302b7513dc8e8474745a1b28187a",
+                "sha256": "392ab7d2ff1430417a50327515538cec3e9f302b7513dc8e8474745a1b28187a",
+                "requires_python": None,
+                "yanked": False,
+                "core_metadata": None,
+            },
+            {
+                "name": "selinon-1.1.0-py3-none-any.whl",
+                "url": "https://files.pythonhosted.org/packages/d1/5d/selinon-1.1.0-py3-none-any.whl"
+                "#sha256=bc3cbb1b0b8e8b5e1c5ef9a2e1d9a4b1df9b0c2e4b3a1c2d3e4f5a6b7c8d9e0f",
+                "sha256": "bc3cbb1b0b8e8b5e1c5ef9a2e1d9a4b1df9b0c2e4b3a1c2d3e4f5a6b7c8d9e0f",
+                "requires_python": ">=3.6",
+                "yanked": "Broken release",
+                "core_metadata": {"sha256": "0f0e0d0c0b0a09080706050403020100f0e0d0c0b0a09080706050403020100f"},
+            },
+        ]
+
+    def test_simple_repository_listing_reused(self):
+        """Test package listing on a simple repository is retrieved once and queried by version."""
+        source = Source("https://example.com/simple", warehouse=False)
+
+        links = []
+        for artifact_name, sha256 in (
+            ("selinon-1.0.tar.gz", "a" * 64),
+            ("selinon-1.0-py3-none-any.whl", "b" * 64),
+            ("selinon-1.0.1.tar.gz", "c" * 64),
+        ):
+            links.append(
+                {
+                    "name": artifact_name,
+                    "url": f"https://example.com/packages/{artifact_name}#sha256={sha256}",
+                    "sha256": sha256,
+                    "requires_python": None,
+                    "yanked": False,
+                }
+            )
+
+        flexmock(Source).should_receive("_simple_repository_list_artifact_links").with_args("selinon").and_return(
+            links
+        ).once()
+
+        assert source.get_package_versions("selinon") == ["1.0", "1.0.1"]
+        assert source.get_package_hashes("selinon", "1.0.0") == [
+            {"name": "selinon-1.0.tar.gz", "sha256": "a" * 64},
+            {"name": "selinon-1.0-py3-none-any.whl", "sha256": "b" * 64},
+        ]
+        assert [item[:2] for item in source._download_artifacts_data("selinon", "1.0.1")] == [
+            ("selinon-1.0.1.tar.gz", "c" * 64)
+        ]
+
+    def test_simple_repository_listing_unparsable(self):
+        """Test artifacts with names from which a version cannot be parsed do not break the package listing."""
+        source = Source("https://example.com/simple", warehouse=False)
+
+        links = [
+            {"name": name, "url": f"https://example.com/packages/{name}#sha256={sha256}", "sha256": sha256}
+            for name, sha256 in (("selinon-1.0.tar.gz", "a" * 64), ("selinon.whl", "b" * 64), ("selinon.zip", "c" * 64))
+        ]
+        flexmock(Source).should_receive("_simple_repository_list_artifact_links").with_args("selinon").and_return(links)
+
+        assert source.get_package_versions("selinon") == ["1.0"]
+        assert source.get_package_hashes("selinon", "1.0") == [{"name": "selinon-1.0.tar.gz", "sha256": "a" * 64}]
+
+    _METADATA = (
+        b"Metadata-Version: 2.1\n"
+        b"Name: selinon\n"
+        b"Version: 1.0.0\n"
+        b"Requires-Python: >=3.6\n"
+        b"Requires-Dist: pyyaml\n"
+        b"Requires-Dist: rainbow-logging-handler\n"
+        b"\n"
+        b"A dynamic task flow management on top of Celery.\n"
+    )
+
+    def test_get_package_metadata(self):
+        """Test obtaining core metadata using core metadata files served by the index."""
+        source = Source("https://example.com/simple", warehouse=False)
+
+        metadata_sha256 = hashlib.sha256(self._METADATA).hexdigest()
+        links = [
+            {
+                "name": "selinon-1.0.0.tar.gz",
+                "url": "https://example.com/packages/selinon-1.0.0.tar.gz",
+                "sha256": None,
+                "core_metadata": None,
+            },
+            {
+                "name": "selinon-1.0.0-py3-none-any.whl",
+                "url": f"https://example.com/packages/selinon-1.0.0-py3-none-any.whl#sha256={'a' * 64}",
+                "sha256": "a" * 64,
+                "core_metadata": {"sha256": metadata_sha256},
+            },
+        ]
+        flexmock(Source).should_receive("_simple_repository_list_artifact_links").with_args("selinon").and_return(links)
+        flexmock(get_session()).should_receive("get").with_args(
+            "https://example.com/packages/selinon-1.0.0-py3-none-any.whl.metadata", verify=True
+        ).and_return(flexmock(status_code=200, content=self._METADATA, raise_for_status=lambda: None)).once()
+        flexmock(Artifact).should_receive("read_metadata").never()
+
+        metadata = source.get_package_metadata("selinon", "1.0.0")
+        assert metadata["name"] == "selinon"
+        assert metadata["requires_python"] == ">=3.6"
+        assert metadata["requires_dist"] == ["pyyaml", "rainbow-logging-handler"]
+        assert metadata["description"] == "A dynamic task flow management on top of Celery.\n"
+
+    def test_parse_core_metadata_availability(self):
+        """Test parsing availability of core metadata files as stated in listings."""
+        assert Source._parse_core_metadata_availability(None) is None
+        assert Source._parse_core_metadata_availability(False) is None
+        assert Source._parse_core_metadata_availability(True) == {}
+        assert Source._parse_core_metadata_availability("true") == {}
+        assert Source._parse_core_metadata_availability("sha256=abc") == {"sha256": "abc"}
+        assert Source._parse_core_metadata_availability({"sha256": "abc"}) == {"sha256": "abc"}
+
+    def test_get_package_metadata_from_artifact(self):
+        """Test obtaining core metadata from an artifact if the index does not serve core metadata files."""
+        source = Source("https://example.com/simple", warehouse=False)
+
+        links = [
+            {
+                "name": "selinon-1.0.0-py3-none-any.whl",
+                "url": "https://example.com/packages/selinon-1.0.0-py3-none-any.whl",
+                "sha256": None,
+                "core_metadata": None,
+            },
+        ]
+        flexmock(Source).should_receive("_simple_repository_list_artifact_links").with_args("selinon").and_return(links)
+        flexmock(Artifact).should_receive("read_metadata").and_return(self._METADATA).once()
+
+        assert source.get_package_metadata("selinon", "1.0.0")["requires_dist"] == [
+            "pyyaml",
+            "rainbow-logging-handler",
+        ]
+        with pytest.raises(NotFoundError):
+            source.get_package_metadata("selinon", "2.0.0")
+
+    @pytest.mark.asyncio
+    async def test_get_package_metadata_from_sdist(self, tmp_path):
+        """Test obtaining core metadata from an sdist served by a server supporting Range requests."""
+        async with TestServer(self._create_sdist_index(tmp_path)) as server:
+            source = Source(str(server.make_url("/simple")), warehouse=False)
+            metadata = await asyncio.get_running_loop().run_in_executor(
+                None, source.get_package_metadata, "selinon", "1.0.0"
+            )
+
+        assert metadata["name"] == "selinon"
+        assert metadata["requires_dist"] == ["pyyaml", "rainbow-logging-handler"]
+
+    def test_get_package_hashes_many(self):
+        """Test obtaining hashes of multiple packages concurrently."""
+        source = Source("https://example.com/simple", warehouse=False)
+
+        def get_package_hashes(package_name, package_version, with_included_files=False):
+            if package_name == "missing":
+                raise NotFoundError("Package not found")
+            return [{"name": f"{package_name}-{package_version}.tar.gz", "sha256": package_name}]
+
+        flexmock(Source).should_receive("get_package_hashes").replace_with(get_package_hashes)
+
+        packages = [("selinon", "1.0.0"), ("missing", "1.0.0"), ("thoth-common", "0.1.0")]
+        results = source.get_package_hashes_many(packages, max_workers=2)
+        assert [(r.package_name, r.package_version) for r in results] == packages
+        assert results[0].hashes == [{"name": "selinon-1.0.0.tar.gz", "sha256": "selinon"}]
+        assert results[0].error is None
+        assert results[1].hashes is None
+        assert isinstance(results[1].error, NotFoundError)
+        assert results[2].hashes == [{"name": "thoth-common-0.1.0.tar.gz", "sha256": "thoth-common"}]
+
+        reports = PythonDigestsFetcher([source]).fetch_digests_many(packages)
+        assert reports == [
+            {source.url: [{"name": "selinon-1.0.0.tar.gz", "sha256": "selinon"}]},
+            {},
+            {source.url: [{"name": "thoth-common-0.1.0.tar.gz", "sha256": "thoth-common"}]},
+        ]
+
     @pytest.mark.online
     @pytest.mark.timeout(60)
     @pytest.mark.asyncio
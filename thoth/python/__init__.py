@@ -21,6 +21,7 @@ from .aiosource import AIOSource
 from .aiosource import AsyncIterableArtifacts
 from .aiosource import AsyncIterablePackages
 from .aiosource import AsyncIterableVersions
+from .compact_set import CompactPackageSet
 from .constraints import Constraints
 from .digests_fetcher import DigestsFetcherBase
 from .digests_fetcher import PythonDigestsFetcher
@@ -44,6 +45,7 @@ __all__ = [
     "AsyncIterableArtifacts",
     "AsyncIterablePackages",
     "AsyncIterableVersions",
+    "CompactPackageSet",
     "Constraints",
     "DigestsFetcherBase",
     "Packages",
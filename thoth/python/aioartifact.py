@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Representation of a python artifact accessed asynchronously."""
+
+import asyncio
+import functools
+import hashlib
+import logging
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+import aiohttp
+import attr
+
+from .artifact import Artifact
+from .artifact import _ArtifactFiles
+from .artifact import _CHUNK_SIZE
+from .artifact_store import get_artifact_store
+from .result_store import get_result_store
+from .retry import retrying_get
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _write_chunk(f: IO[bytes], digest: Any, chunk: bytes) -> None:
+    """Write a downloaded chunk to the given file and update digest of the downloaded content."""
+    digest.update(chunk)
+    f.write(chunk)
+
+
+def _inspect_artifact(
+    artifact_name: str,
+    artifact_url: str,
+    compressed_file: Optional[str],
+    sha: Optional[str],
+    sha_verified: bool,
+    verify_ssl: bool,
+    method: str,
+    kwargs: Dict[str, Any],
+) -> Any:
+    """Inspect the given artifact using the given Artifact method, used to inspect artifacts in a process pool."""
+    artifact = Artifact(artifact_name, artifact_url, verify_ssl=verify_ssl, sha=sha)
+    artifact._sha_verified = sha_verified
+    if compressed_file is not None:
+        artifact.compressed_file = compressed_file
+    return getattr(artifact, method)(**kwargs)
+
+
+def _get_thread_executor(executor: Optional[Executor]) -> Optional[Executor]:
+    """Get executor to run work which cannot leave the current process, None stands for the loop default executor."""
+    return None if isinstance(executor, ProcessPoolExecutor) else executor
+
+
+@attr.s(slots=True)
+class AsyncArtifact(_ArtifactFiles):
+    """A Python artifact accessed asynchronously.
+
+    The artifact is downloaded using aiohttp, the session passed is used if any. All the blocking work - writing
+    to disk, hashing and inspecting the artifact - is done in an executor so that the event loop is never blocked.
+    Inspection of the downloaded artifact is delegated to Artifact and is run in the executor passed, which can
+    be a process pool. Other blocking work and inspection without an executor passed is done in the loop
+    default executor.
+    """
+
+    artifact_name = attr.ib(type=str)
+    artifact_url = attr.ib(type=str)
+    compressed_file = attr.ib(type=Optional[str], default=None)
+    verify_ssl = attr.ib(type=bool, default=False)
+    _sha = attr.ib(type=Optional[str], default=None)
+    session = attr.ib(type=Optional[aiohttp.ClientSession], default=None, eq=False, repr=False)
+    executor = attr.ib(type=Optional[Executor], default=None, eq=False, repr=False)
+    _artifact = attr.ib(type=Optional[Artifact], default=None, init=False, repr=False, eq=False)
+    _download_lock = attr.ib(type=Optional[asyncio.Lock], default=None, init=False, repr=False, eq=False)
+
+    @staticmethod
+    async def _run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run the given blocking function in an executor."""
+        return await asyncio.get_event_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def _inspect(self, method: str, download: bool, **kwargs: Any) -> Any:
+        """Inspect the artifact using the given Artifact method in the executor, optionally download it first."""
+        artifact = await self._get_artifact(download)
+        if isinstance(self.executor, ProcessPoolExecutor):
+            # Artifact instances own temporary files, a new one is created in the worker process.
+            func = functools.partial(
+                _inspect_artifact,
+                self.artifact_name,
+                self.artifact_url,
+                self.compressed_file,
+                self._sha,
+                self._sha_verified,
+                self.verify_ssl,
+                method,
+                kwargs,
+            )
+        else:
+            func = functools.partial(getattr(artifact, method), **kwargs)
+
+        return await asyncio.get_event_loop().run_in_executor(self.executor, func)
+
+    async def sha(self) -> str:
+        """Get SHA256 of the artifact, computed lazily as it can require downloading the artifact."""
+        if self._sha is None:
+            self._sha = self._get_sha_from_url(self.artifact_url)
+
+        if self._sha is None:
+            if self.compressed_file is None:
+                # The digest is computed while downloading.
+                await self._download_if_necessary()
+            else:
+                artifact = await self._get_artifact(False)
+                self._sha = await self._run(lambda: artifact.sha)
+                self._sha_verified = artifact._sha_verified
+
+        return self._sha  # type: ignore
+
+    async def _download_if_necessary(self) -> None:
+        """Download the artifact if not downloaded yet, concurrent callers wait for a single download."""
+        if self._download_lock is None:
+            self._download_lock = asyncio.Lock()
+
+        async with self._download_lock:
+            if self.compressed_file is None:
+                await self._download_artifact()
+
+    async def _download_artifact(self) -> None:
+        """Download the artifact, compute its SHA256 while downloading, see Artifact for use of artifact store."""
+        store = get_artifact_store()
+        if await self._run(self._take_stored, store):
+            return
+
+        _LOGGER.debug("Downloading artifact from url %r", self.artifact_url)
+        f = await self._run(self._create_download_file, store)
+        digest = hashlib.sha256()
+        try:
+            if self.session is not None and not self.session.closed:
+                await self._download_to(self.session, f, digest)
+            else:
+                async with aiohttp.ClientSession() as session:
+                    await self._download_to(session, f, digest)
+        finally:
+            await self._run(f.close)
+
+        await self._run(self._use_downloaded, store, f.name, digest.hexdigest())
+
+    async def _download_to(self, session: aiohttp.ClientSession, f: IO[bytes], digest: Any) -> None:
+        """Download the artifact using the given session to the given file, update digest of the content."""
+        async with retrying_get(session, self.artifact_url, ssl=self.verify_ssl) as response:
+            async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                await self._run(_write_chunk, f, digest, chunk)
+
+    async def _get_artifact(self, download: bool) -> Artifact:
+        """Get artifact used to inspect the artifact, optionally download the artifact asynchronously first.
+
+        If not downloaded, the artifact is accessed as needed by Artifact in an executor.
+        """
+        if download:
+            await self._download_if_necessary()
+
+        if self._artifact is None:
+            self._artifact = Artifact(self.artifact_name, self.artifact_url, verify_ssl=self.verify_ssl)
+
+        if self._artifact.compressed_file is None:
+            self._artifact.compressed_file = self.compressed_file
+        if self._artifact._sha is None:
+            self._artifact._sha = self._sha
+        if self._sha_verified:
+            self._artifact._sha_verified = True
+
+        return self._artifact
+
+    async def _is_stored(self, *kinds: str) -> bool:
+        """Check if a result of any of the given kinds is stored for the artifact, without downloading it."""
+        store = get_result_store()
+        sha = self._get_known_sha()
+        if store is None or sha is None:
+            return False
+
+        for kind in kinds:
+            if await self._run(store.get, sha, kind) is not None:
+                return True
+
+        return False
+
+    async def gather_hashes(self, **kwargs: Any) -> list:
+        """Calculate checksums and gather hashes of all file in the artifact, see Artifact.gather_hashes.
+
+        The artifact is not downloaded if results are stored in the result store or digests are taken from
+        RECORD of a wheel read remotely.
+        """
+        kind = "hashes" if kwargs.get("in_archive", True) else "hashes-extracted"
+        if kwargs.get("use_record"):
+            download = not self.artifact_name.endswith(".whl") and not await self._is_stored("hashes-record", kind)
+        else:
+            download = not await self._is_stored(kind)
+
+        return await self._inspect("gather_hashes", download, **kwargs)  # type: ignore
+
+    async def get_versioned_symbols(self, **kwargs: Any) -> dict:
+        """Get all dynamic symbols required by ELF objects in the artifact, see Artifact.get_versioned_symbols.
+
+        The artifact is not downloaded if results are stored in the result store.
+        """
+        kind = "symbols" if kwargs.get("in_archive", True) else "symbols-extracted"
+        return await self._inspect("get_versioned_symbols", not await self._is_stored(kind), **kwargs)  # type: ignore
+
+    async def read_metadata(self) -> bytes:
+        """Read core metadata of the artifact, see Artifact.read_metadata."""
+        return await self._inspect("read_metadata", False)  # type: ignore
@@ -17,120 +17,220 @@
 
 """Representation of source (index) for Python packages."""
 
+import copy
+import functools
+import itertools
+import json
 import logging
 
-from functools import lru_cache
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
 
 import attr
 import asyncio
 import aiohttp
-from urllib.parse import urljoin
-from urllib.parse import unquote
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from .exceptions import NotFoundError
-from .artifact import Artifact
+from .aioartifact import AsyncArtifact
+from .aioartifact import _get_thread_executor
+from .configuration import config
+from .retry import retrying_get
+from .artifact_listing import ArtifactListing
+from .cache import cache
+from .source import PackageHashesResult
+from .source import PackageVersionsResult
 from .source import Source
+from .source import _PackageLinkTarget
+from .source import _STREAM_CHUNK_SIZE
+from .source import _create_cache_key
+from .source import SIMPLE_API_ACCEPT
 
-from typing import Optional, Set, Tuple, List, Dict
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Tuple, List, Dict
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class AsyncIterablePackages:
-    """Async Iterator for Packages."""
+def _cached_async(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Cache results of the decorated AIOSource coroutine method in the shared in-process cache.
+
+    Concurrent calls with the same arguments are coalesced into a single computation. The result is shared by
+    all the callers, the decorated method should return an immutable value.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: "AIOSource", *args: Any, **kwargs: Any) -> Any:
+        key = _create_cache_key(self, method, args, kwargs)
+        return await cache.get_or_compute_async(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
 
-    def __init__(self, _packages: Set[str]):  # Ignore PyDocStyleBear
-        """Initialize Async Iterable instance for Packages."""
-        self.packages = _packages
+class _AsyncIterableBatches:
+    """Async iterator over items produced in batches.
 
-    def __aiter__(self):  # Ignore PyDocStyleBear
+    Items can be given upfront or produced by an async iterator of batches, for example while a response is
+    being parsed. Items of a batch are returned without yielding to the event loop, the loop is entered only
+    to produce the next batch. Consumers can iterate over whole batches using the batches method.
+    """
+
+    def __init__(self, items: Iterable[Any] = (), batches: Optional[AsyncIterator[List[Any]]] = None) -> None:
+        """Initialize the iterator with items available and an optional async iterator of further batches."""
+        self._items = deque(items)
+        self._batches = batches
+
+    def __aiter__(self) -> "_AsyncIterableBatches":
         """Return asynchronous iterator."""
         return self
 
-    async def __anext__(self) -> str:  # Ignore PyDocStyleBear
-        """Return awaitable object."""
+    async def __anext__(self) -> Any:
+        """Return the next item."""
         data = await self.fetch_data()
-
-        if data:
-            return data
-        else:
+        if data is None:
             raise StopAsyncIteration
 
-    async def fetch_data(self) -> Optional[str]:  # Ignore PyDocStyleBear
-        """Fetch data."""
-        await asyncio.sleep(0)  # Other coros get to run
+        return data
 
-        if len(self.packages) == 0:
+    async def _next_batch(self) -> Optional[List[Any]]:
+        """Produce the next batch, return None if there are no more batches."""
+        if self._batches is None:
             return None
 
-        return self.packages.pop()
+        try:
+            return await self._batches.__anext__()
+        except StopAsyncIteration:
+            self._batches = None
+            return None
 
+    async def fetch_data(self) -> Any:
+        """Fetch the next item, return None if there are no more items."""
+        while not self._items:
+            batch = await self._next_batch()
+            if batch is None:
+                return None
 
-class AsyncIterableVersions:
-    """Async Iterator for Versions."""
+            self._items.extend(batch)
 
-    def __init__(self, _versions: Set[str]):  # Ignore PyDocStyleBear
-        """Initialize Async Iterable Versions instance for Versions."""
-        self.versions = _versions
+        return self._items.popleft()
 
-    def __aiter__(self):  # Ignore PyDocStyleBear
-        """Return asynchronous iterator."""
-        return self
+    async def batches(self) -> AsyncIterator[List[Any]]:
+        """Iterate over batches of items as they are produced."""
+        if self._items:
+            items = list(self._items)
+            self._items.clear()
+            yield items
 
-    async def __anext__(self) -> str:  # Ignore PyDocStyleBear
-        """Return awaitable object."""
-        data = await self.fetch_data()
+        while True:
+            batch = await self._next_batch()
+            if batch is None:
+                break
 
-        if data:
-            return data
-        else:
-            raise StopAsyncIteration
+            if batch:
+                yield batch
 
-    async def fetch_data(self) -> Optional[str]:  # Ignore PyDocStyleBear
-        """Fetch data."""
-        await asyncio.sleep(0)  # Other coros get to run
+    async def aclose(self) -> None:
+        """Stop producing items, release resources such as a response being parsed."""
+        self._items.clear()
+        batches, self._batches = self._batches, None
+        if batches is not None and hasattr(batches, "aclose"):
+            await batches.aclose()  # type: ignore
 
-        if len(self.versions) == 0:
-            return None
 
-        return self.versions.pop()
+class AsyncIterablePackages(_AsyncIterableBatches):
+    """Async Iterator for Packages."""
 
 
-class AsyncIterableArtifacts:
+class AsyncIterableVersions(_AsyncIterableBatches):
+    """Async Iterator for Versions."""
+
+
+class AsyncIterableArtifacts(_AsyncIterableBatches):
     """Async Iterator for Artifacts."""
 
-    def __init__(self, artifacts: List[Tuple[str, str]]):  # Ignore PyDocStyleBear
-        """Initialize Async Iterable instance for Artifacts."""
-        self.artifacts = artifacts
 
-    def __aiter__(self):  # Ignore PyDocStyleBear
-        """Return asynchronous iterator."""
-        return self
+@attr.s(frozen=True, slots=True)
+class AIOSource(Source):
+    """Representation of source (Python index) for Python packages.
+
+    An aiohttp session can be passed to be used for all requests. Otherwise, the source can be used as an async
+    context manager which owns a session for its lifetime. If there is no session available, a session is
+    created for each request.
+
+    CPU-bound work - parsing of large listings, decoding of large JSON documents and inspection of artifacts -
+    is run in the executor passed, either a thread or a process pool, or in the loop default executor.
+    """
+
+    session = attr.ib(type=Optional[aiohttp.ClientSession], default=None, eq=False, repr=False)
+    executor = attr.ib(type=Optional[Executor], default=None, eq=False, repr=False)
+    _owned_session = attr.ib(type=Optional[aiohttp.ClientSession], default=None, init=False, eq=False, repr=False)
+
+    def _create_session(self, limit_per_host: Optional[int] = None) -> aiohttp.ClientSession:
+        """Create a session with connection pools sized based on configuration unless limit per host is given."""
+        if limit_per_host is None:
+            limit_per_host = config.http_pool_maxsize_per_host.get(
+                urlparse(self.url).hostname, config.http_pool_maxsize
+            )
+
+        connector = aiohttp.TCPConnector(
+            limit=max(config.http_pool_connections * config.http_pool_maxsize, limit_per_host),
+            limit_per_host=limit_per_host,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    def _get_active_session(self) -> Optional[aiohttp.ClientSession]:
+        """Get the session passed or owned by the source if not closed."""
+        session = self.session or self._owned_session
+        if session is None or session.closed:
+            return None
 
-    async def __anext__(self) -> Tuple:  # Ignore PyDocStyleBear
-        """Return awaitable object."""
-        data = await self.fetch_data()
+        return session
 
-        if data:
-            return data
-        else:
-            raise StopAsyncIteration
+    @asynccontextmanager
+    async def _get_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Get a session to perform requests, create one for the request if there is no session available."""
+        session = self._get_active_session()
+        if session is not None:
+            yield session
+            return
 
-    async def fetch_data(self) -> Optional[Tuple]:  # Ignore PyDocStyleBear
-        """Fetch data."""
-        await asyncio.sleep(0)  # Other coros get to run
+        async with self._create_session() as session:
+            yield session
 
-        if len(self.artifacts) == 0:
-            return None
+    async def __aenter__(self) -> "AIOSource":
+        """Create a session owned by the source unless a session was passed."""
+        if self.session is None and self._owned_session is None:
+            # The instance is frozen, the session is not part of its value.
+            object.__setattr__(self, "_owned_session", self._create_session())
 
-        return self.artifacts.pop()
+        return self
 
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the session owned by the source."""
+        await self.close()
 
-@attr.s(frozen=True, slots=True)
-class AIOSource(Source):
-    """Representation of source (Python index) for Python packages."""
+    async def close(self) -> None:
+        """Close the session owned by the source, sessions passed are left to be closed by the caller."""
+        if self._owned_session is not None:
+            await self._owned_session.close()
+            object.__setattr__(self, "_owned_session", None)
+
+    async def _offload(self, size: int, func: Callable[..., Any], *args: Any) -> Any:
+        """Run the given CPU-bound function on input of the given size in the executor unless the input is small.
+
+        Functions run in a process pool and their arguments have to be picklable.
+        """
+        if size < config.offload_min_bytes:
+            return func(*args)
+
+        return await asyncio.get_event_loop().run_in_executor(self.executor, functools.partial(func, *args))
+
+    async def _read_json(self, response: aiohttp.ClientResponse) -> Any:
+        """Read JSON document from the given response, large documents are decoded in the executor."""
+        content = await response.read()
+        return await self._offload(len(content), json.loads, content)
 
     async def _warehouse_get_api_package_version_info(  # type: ignore
         self, package_name: str, package_version: str
@@ -140,10 +240,10 @@ class AIOSource(Source):
 
         _LOGGER.debug("Gathering package version information from Warehouse API: %r", url)
 
-        async with aiohttp.ClientSession(raise_for_status=True) as session:
+        async with self._get_session() as session:
             try:
-                async with session.get(url) as response:
-                    return await response.json()
+                async with retrying_get(session, url) as response:
+                    return await self._read_json(response)
             except aiohttp.ClientResponseError as exc:
                 if exc.status == 404:
                     raise NotFoundError(
@@ -157,61 +257,76 @@ class AIOSource(Source):
         self, package_name: str, package_version: str, with_included_files: bool = False
     ) -> List[Dict]:
         """Gather information about SHA hashes available for the given package-version release."""
-        package_info = await self._warehouse_get_api_package_version_info(package_name, package_version)
+        listing = await self._warehouse_get_listing(package_name)
+        if listing.has_version(package_version):
+            items = [(a["name"], a["url"], a["sha256"]) for a in listing.get_artifacts(package_version)]
+        else:
+            # Not listed in releases of the package, ask the release endpoint which can be more permissive.
+            package_info = await self._warehouse_get_api_package_version_info(package_name, package_version)
+            items = [(i["filename"], i["url"], i["digests"]["sha256"]) for i in package_info["urls"]]
 
         result = []
-        for item in package_info["urls"]:
-            result.append({"name": item["filename"], "sha256": item["digests"]["sha256"]})
+        for artifact_name, artifact_url, sha256 in items:
+            result.append({"name": artifact_name, "sha256": sha256})
             # this checks whether to gather digests for all files in the given artifact
             if with_included_files:
-                artifact = Artifact(item["filename"], item["url"], verify_ssl=self.verify_ssl)
-                result[-1]["digests"] = artifact.gather_hashes()
-                result[-1]["symbols"] = artifact.get_versioned_symbols()
+                artifact = AsyncArtifact(
+                    artifact_name,
+                    artifact_url,
+                    verify_ssl=self.verify_ssl,
+                    sha=sha256,
+                    session=self._get_active_session(),
+                    executor=self.executor,
+                )
+                result[-1]["digests"] = await artifact.gather_hashes()
+                result[-1]["symbols"] = await artifact.get_versioned_symbols()
 
         return result
 
+    @_cached_async
+    async def _warehouse_get_listing(self, package_name: str) -> ArtifactListing:  # type: ignore
+        """Retrieve artifacts of all the releases of the given package from Warehouse, indexed by version."""
+        return self._create_warehouse_listing(package_name, await self._warehouse_get_api_package_info(package_name))
+
     async def _warehouse_get_api_package_info(self, package_name: str) -> Dict:  # type: ignore
         """Use API of the deployed Warehouse to gather package information."""
         url = self.get_api_url() + f"/{package_name}/json"
 
         _LOGGER.debug("Gathering package information from Warehouse API: %r", url)
 
-        async with aiohttp.ClientSession(raise_for_status=True) as session:
+        async with self._get_session() as session:
             try:
-                async with session.get(url) as response:
-                    return await response.json()
+                async with retrying_get(session, url) as response:
+                    return await self._read_json(response)
             except aiohttp.ClientResponseError as exc:
                 if exc.status == 404:
                     raise NotFoundError(f"Package {package_name} not found on warehouse {self.url} ({self.name})")
 
                 raise
 
+    @_cached_async
+    async def _simple_repository_get_listing(self, package_name: str) -> ArtifactListing:  # type: ignore
+        """Retrieve artifacts available for the given package on a simple repository, indexed by version."""
+        links = await self._simple_repository_list_artifact_links(package_name)
+        return self._create_artifact_listing(package_name, links)
+
     async def _simple_repository_list_versions(self, package_name: str) -> List:  # type: ignore
         """List versions of package available on a simple repository."""
-        result = set()
-        a = await self._simple_repository_list_artifacts(package_name)
-
-        async for artifact_name, _ in a:
-            result.add(self._parse_artifact_version(package_name, artifact_name))
-
-        to_ret = list(result)
-
+        result = (await self._simple_repository_get_listing(package_name)).versions()
         _LOGGER.debug("Versions available on %r (index with name %r): %r", self.url, self.name, result)
-        return to_ret
+        return result
 
-    async def _simple_repository_list_artifacts(self, package_name: str) -> AsyncIterableArtifacts:  # type: ignore
-        """Parse simple repository package listing (HTML) and return artifacts present there."""
+    async def _simple_repository_list_artifact_links(self, package_name: str) -> List[Dict]:  # type: ignore
+        """Retrieve artifacts listed on a simple repository, prefer JSON based API (PEP-691) if offered."""
         url = self.url + "/" + package_name
-        links = []
 
         _LOGGER.debug("Discovering package %r artifacts from %r", package_name, url)
 
-        async with aiohttp.ClientSession(raise_for_status=True) as session:
+        async with self._get_session() as session:
             try:
-                async with session.get(url) as response:
+                async with retrying_get(session, url, headers={"Accept": SIMPLE_API_ACCEPT}) as response:
                     text = await response.text()
-                    soup = BeautifulSoup(text, "lxml")
-                    links = soup.find_all("a")
+                    content_type = response.headers.get("Content-Type")
             except aiohttp.ClientResponseError as exc:
                 if exc.status == 404:
                     raise NotFoundError(
@@ -220,121 +335,265 @@ class AIOSource(Source):
 
                 raise
 
-        artifacts = []  # List[Tuple[str,str]]
-        for link in links:
-            artifact_name_full = str(link["href"]).rsplit("/", maxsplit=1)
-            if len(artifact_name_full) == 2:
-                # If full URL provided by index.
-                artifact_name = artifact_name_full[1]
-            else:
-                artifact_name = artifact_name_full[0]
-
-            artifact_parts = artifact_name.rsplit("#", maxsplit=1)
-            if len(artifact_parts) == 2:
-                artifact_name = artifact_parts[0]
-
-            if not artifact_name.endswith((".tar.gz", ".whl")):
-                _LOGGER.debug("Link does not look like a package for %r: %r", package_name, link["href"])
-                continue
-
-            artifact_url = link["href"]
-            if not artifact_url.startswith(("http://", "https://")):
-                artifact_url = urljoin(url, artifact_url)
-
-            # Decode characters in link retrieved
-            artifact_name = unquote(artifact_name)
+        return await self._offload(  # type: ignore
+            len(text), type(self)._parse_simple_repository_listing, package_name, url, content_type, text
+        )
 
-            artifacts.append((artifact_name, artifact_url))
-
-        return AsyncIterableArtifacts(artifacts)
+    async def _simple_repository_list_artifacts(self, package_name: str) -> AsyncIterableArtifacts:  # type: ignore
+        """Parse simple repository package listing and return artifacts present there."""
+        links = await self._simple_repository_list_artifact_links(package_name)
+        return AsyncIterableArtifacts([(link["name"], link["url"]) for link in links])
+
+    @classmethod
+    def _parse_listed_package_link(cls, href: str, link_text: str) -> Optional[str]:
+        """Get normalized package name out of a link present on the root simple repository listing, if any.
+
+        Unlike Source, names stated in links are normalized and not checked to be valid package names.
+        """
+        package_parts = href.rsplit("/", maxsplit=2)
+        # According to PEP-503, package names must have trailing '/', but check this explicitly
+        if not package_parts[-1]:
+            package_parts = package_parts[:-1]
+        package_name = cls.normalize_package_name(package_parts[-1])
+
+        # Discard links to parent dirs (package name of URL does not match the text.
+        link_text = cls.normalize_package_name(link_text)
+        if link_text.endswith("/"):
+            link_text = link_text[:-1]
+
+        if package_name == link_text:
+            return package_name
+
+        return None
+
+    async def _iter_package_batches(self) -> AsyncIterator[List[str]]:
+        """Iterate over batches of package names available, parsed while the listing is being downloaded."""
+        async with self._get_session() as session:
+            async with retrying_get(session, self.url) as response:
+                target = _PackageLinkTarget(self._parse_listed_package_link)
+                parser = etree.HTMLParser(target=target, encoding="utf-8")
+                # The parser keeps its state in this process, chunks are parsed in a thread.
+                executor = _get_thread_executor(self.executor)
+                loop = asyncio.get_event_loop()
+                async for chunk in response.content.iter_chunked(_STREAM_CHUNK_SIZE):
+                    if len(chunk) < config.offload_min_bytes:
+                        parser.feed(chunk)
+                    else:
+                        await loop.run_in_executor(executor, parser.feed, chunk)
+                    yield target.pop_package_names()
+
+                parser.close()
+                yield target.pop_package_names()
 
     async def get_packages(self) -> Optional[AsyncIterablePackages]:  # type: ignore
-        """List packages available on the source package index."""
-        _LOGGER.debug(f"Discovering packages available on {self.url} (simple index name: {self.name})")
-
-        links = []
+        """List packages available on the source package index.
 
-        async with aiohttp.ClientSession(raise_for_status=True) as session:
-            async with session.get(self.url) as resp:
-                text = await resp.text()
-
-                soup = BeautifulSoup(text, "lxml")
-                links = soup.find_all("a")
-
-        if len(links) == 0:
-            return None
+        Package names are produced while the listing is being downloaded, None is returned if there are no
+        packages listed.
+        """
+        _LOGGER.debug(f"Discovering packages available on {self.url} (simple index name: {self.name})")
 
-        packages = set()
-        for link in links:
-            package_parts = link["href"].rsplit("/", maxsplit=2)
-            # According to PEP-503, package names must have trailing '/', but check this explicitly
-            if not package_parts[-1]:
-                package_parts = package_parts[:-1]
-            package_name = self.normalize_package_name(package_parts[-1])
+        batches = self._iter_package_batches()
+        async for batch in batches:
+            if batch:
+                return AsyncIterablePackages(batch, batches)
 
-            # Discard links to parent dirs (package name of URL does not match the text.
-            link_text = self.normalize_package_name(link.text)
-            if link_text.endswith("/"):
-                # Link names should end with trailing / according to PEEP:
-                #   https://www.python.org/dev/peps/pep-0503/
-                link_text = link_text[:-1]
+        return None
 
-            if package_name == link_text:
-                packages.add(package_name)
+    @_cached_async
+    async def _get_package_versions(self, package_name: str) -> Tuple[str, ...]:
+        """Get versions available for the given package."""
+        if not self.warehouse:
+            return tuple(await self._simple_repository_list_versions(package_name))
 
-        return AsyncIterablePackages(packages)
+        listing = await self._warehouse_get_listing(package_name)
+        return tuple(listing.versions())
 
-    @lru_cache(maxsize=64)
     async def get_package_versions(self, package_name: str) -> AsyncIterableVersions:  # type: ignore
         """Get listing of versions available for the given package."""
-        if not self.warehouse:
-            return AsyncIterableVersions(set(await self._simple_repository_list_versions(package_name)))
-
-        package_info = await self._warehouse_get_api_package_info(package_name)
-        return AsyncIterableVersions(set(package_info["releases"].keys()))
+        return AsyncIterableVersions(set(await self._get_package_versions(package_name)))
 
-    async def get_package_artifacts(self, package_name: str, package_version: str):
+    async def get_package_artifacts(self, package_name: str, package_version: str) -> List[AsyncArtifact]:
         """Return list of artifacts corresponding to package name and package version."""
         to_return = []
-        possible_continuations = [".win32", ".tar.gz", ".whl", ".zip", ".exe", ".egg", "-"]
-        async for artifact_name, artifact_url in await self._simple_repository_list_artifacts(package_name):
+        listing = await self._simple_repository_get_listing(package_name)
+        for artifact_info in listing.get_artifacts(package_version):
             # Convert all artifact names to lowercase - as a shortcut we simply convert everything to lowercase.
-            artifact_name = artifact_name.lower()
-
-            for i in possible_continuations:
-                if (
-                    artifact_name.startswith(f"{package_name}-{package_version}")
-                    or artifact_name.startswith(f"{package_name.replace('-', '_')}-{package_version}")
-                ) and artifact_name.endswith(i):
-                    break
-            else:
-                _LOGGER.debug(
-                    "Skipping artifact %r as it does not match required version %r for package %r",
+            artifact_name = artifact_info["name"].lower()
+            to_return.append(
+                AsyncArtifact(
                     artifact_name,
-                    package_version,
-                    package_name,
+                    artifact_info["url"],
+                    verify_ssl=self.verify_ssl,
+                    sha=artifact_info.get("sha256"),
+                    session=self._get_active_session(),
+                    executor=self.executor,
                 )
-                continue
-            to_return.append(Artifact(artifact_name, artifact_url, verify_ssl=self.verify_ssl))
+            )
 
         return to_return
 
-    @lru_cache(maxsize=10)
+    async def get_package_metadata(self, package_name: str, package_version: str) -> Dict[str, Any]:  # type: ignore
+        """Get core metadata of the given package in the given version, see Source.get_package_metadata."""
+        listing = await self._simple_repository_get_listing(package_name)
+        artifacts = self._get_core_metadata_artifacts(listing, package_version)
+
+        async with self._get_session() as session:
+            for artifact_info in artifacts:
+                if artifact_info.get("core_metadata") is None:
+                    break
+
+                url = self._get_core_metadata_url(artifact_info)
+                _LOGGER.debug("Retrieving core metadata of %r from %r", artifact_info["name"], url)
+                try:
+                    async with retrying_get(session, url) as response:
+                        content = await response.read()
+                except aiohttp.ClientResponseError as exc:
+                    if exc.status == 404:
+                        _LOGGER.debug("Core metadata file %r advertised but not found", url)
+                        continue
+
+                    raise
+
+                if self._verify_core_metadata(artifact_info, content):
+                    return self._parse_core_metadata(content)
+
+        artifact_info = artifacts[0]
+        artifact = AsyncArtifact(
+            artifact_info["name"],
+            artifact_info["url"],
+            verify_ssl=self.verify_ssl,
+            sha=artifact_info.get("sha256"),
+            session=self._get_active_session(),
+            executor=self.executor,
+        )
+        return self._parse_core_metadata(await artifact.read_metadata())
+
     async def get_package_hashes(  # type: ignore
         self, package_name: str, package_version: str, with_included_files: bool = False
     ) -> List:
         """Get information about release hashes available in this source index."""
+        # Results are shared with other callers, hand out a copy.
+        return copy.deepcopy(list(await self._get_package_hashes(package_name, package_version, with_included_files)))
+
+    @_cached_async
+    async def _get_package_hashes(
+        self, package_name: str, package_version: str, with_included_files: bool = False
+    ) -> Tuple[Dict[str, Any], ...]:
+        """Get information about release hashes, the result is cached."""
         if self.warehouse:
-            return await self._warehouse_get_package_hashes(package_name, package_version, with_included_files)
+            return tuple(await self._warehouse_get_package_hashes(package_name, package_version, with_included_files))
 
         artifacts = await self.get_package_artifacts(package_name, package_version)
         result = []
         for artifact in artifacts:
-            doc = {}
+            doc = {}  # type: Dict[str, Any]
             doc["name"] = artifact.artifact_name
-            doc["sha256"] = artifact.sha
+            doc["sha256"] = await artifact.sha()
             if with_included_files:
-                doc["digests"] = artifact.gather_hashes()
+                doc["digests"] = await artifact.gather_hashes()
             result.append(doc)
 
-        return result
+        return tuple(result)
+
+    async def _stream_many(
+        self,
+        items: Iterable[Any],
+        query: Callable[["AIOSource", Any], Awaitable[Any]],
+        concurrency: Optional[int],
+        limit_per_host: Optional[int],
+        timeout: Optional[float],
+    ) -> AsyncIterator[Tuple[Any, Any, Optional[Exception]]]:
+        """Run the given query for each item with bounded concurrency, yield results in completion order.
+
+        Each result is yielded together with its item and the error raised by the query, if any. If a limit
+        per host is given, queries are run using a dedicated session with connections limited accordingly.
+        """
+        source = self
+        session = None
+        if limit_per_host is not None:
+            session = self._create_session(limit_per_host)
+            source = attr.evolve(self, session=session)
+
+        async def run(item: Any) -> Any:
+            return await asyncio.wait_for(query(source, item), timeout)
+
+        items = iter(items)
+        concurrency = concurrency or config.http_pool_maxsize
+        pending = {}  # type: Dict[asyncio.Future, Any]
+        try:
+            while True:
+                # Items are scheduled lazily so that at most concurrency queries are in flight.
+                for item in itertools.islice(items, concurrency - len(pending)):
+                    pending[asyncio.ensure_future(run(item))] = item
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as exc:
+                        _LOGGER.debug("Failed to query %r for %r: %s", self.url, item, str(exc) or type(exc).__name__)
+                        yield item, None, exc
+                    else:
+                        yield item, result, None
+        finally:
+            # The caller stopped consuming results or failed.
+            for task in pending:
+                task.cancel()
+
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+            if session is not None:
+                await session.close()
+
+    async def get_package_versions_many(
+        self,
+        package_names: Iterable[str],
+        *,
+        concurrency: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[PackageVersionsResult]:
+        """Get versions of the given packages concurrently, results are yielded in completion order.
+
+        At most concurrency queries are in flight, defaulting to the size of the HTTP connection pool, each
+        query can take at most timeout seconds. A failure to obtain versions of a package is reported in the
+        corresponding result instead of failing the whole stream.
+        """
+
+        async def query(source: "AIOSource", package_name: str) -> List[str]:
+            return list(await source._get_package_versions(package_name))
+
+        async for package_name, versions, error in self._stream_many(
+            package_names, query, concurrency, limit_per_host, timeout
+        ):
+            yield PackageVersionsResult(package_name=package_name, versions=versions, error=error)
+
+    async def get_package_hashes_many(  # type: ignore
+        self,
+        packages: Iterable[Tuple[str, str]],
+        *,
+        with_included_files: bool = False,
+        concurrency: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[PackageHashesResult]:
+        """Get release hashes for the given package name and version pairs concurrently, see Source.
+
+        Results are yielded in completion order, see get_package_versions_many for the meaning of the limits.
+        """
+
+        async def query(source: "AIOSource", package: Tuple[str, str]) -> List:
+            return await source.get_package_hashes(package[0], package[1], with_included_files)  # type: ignore
+
+        async for (package_name, package_version), hashes, error in self._stream_many(
+            packages, query, concurrency, limit_per_host, timeout
+        ):
+            yield PackageHashesResult(
+                package_name=package_name, package_version=package_version, hashes=hashes, error=error
+            )
@@ -17,23 +17,180 @@
 
 """Representation a python module and all the files within."""
 
+import base64
+import csv
+import io
 import shutil
 import logging
-import requests
+import random
 import tempfile
 import zipfile
 import tarfile
 import hashlib
 import os
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from elftools.common.exceptions import ELFError
 from elftools.elf.elffile import ELFFile
-from typing import Iterator, Tuple, Any
+from typing import IO, Callable, Dict, Iterator, List, Set, Tuple, Any, Optional, Union
 import attr
 
+from .artifact_store import ArtifactStore
+from .artifact_store import get_artifact_store
+from .exceptions import ArtifactDigestMismatchError
+from .exceptions import NotFoundError
+from .remote_file import RemoteFile
+from .result_store import get_result_store
+from .session import get_session
+
 _LOGGER = logging.getLogger(__name__)
+# Size of chunks in which artifacts are downloaded and hashed.
+_CHUNK_SIZE = 1024 * 1024
+_ELF_MAGIC = b"\x7fELF"
+# ELF objects bigger than this are spooled to disk when inspected.
+_SPOOL_MAX_SIZE = 32 * 1024 * 1024
+# Files with these suffixes are not inspected for ELF objects.
+_NON_ELF_SUFFIXES = (
+    ".py",
+    ".pyc",
+    ".pyi",
+    ".pyx",
+    ".pxd",
+    ".pth",
+    ".typed",
+    ".txt",
+    ".md",
+    ".rst",
+    ".json",
+    ".yaml",
+    ".yml",
+    ".toml",
+    ".cfg",
+    ".ini",
+    ".xml",
+    ".html",
+    ".css",
+    ".js",
+    ".csv",
+    ".proto",
+    ".h",
+    ".hpp",
+    ".c",
+    ".cc",
+    ".cpp",
+    ".cu",
+    ".png",
+    ".jpg",
+    ".gif",
+    ".svg",
+    ".ico",
+)
+
+
+@attr.s
+class _ArtifactFiles:
+    """Files holding an artifact, downloaded or taken from the artifact store, shared by Artifact and AsyncArtifact.
+
+    Methods are blocking, AsyncArtifact runs them in an executor. Attributes annotated are defined by subclasses.
+    """
+
+    artifact_url: str
+    compressed_file: Optional[str]
+    _sha: Optional[str]
+
+    # Temporary files and directories created by the instance, removed once the instance is destroyed.
+    _temporary_paths = attr.ib(type=List[str], factory=list, init=False, repr=False, eq=False)
+    # The artifact taken from the artifact store, kept open so that it is not evicted while in use.
+    _store_file = attr.ib(type=Optional[IO[bytes]], default=None, init=False, repr=False, eq=False)
+    # Set once the digest is known to match content of the artifact, only then results are persisted.
+    _sha_verified = attr.ib(type=bool, default=False, init=False, repr=False, eq=False)
+
+    @staticmethod
+    def _get_sha_from_url(artifact_url: str) -> Optional[str]:
+        """Get SHA256 stated in the fragment of the given artifact URL, if any."""
+        url_parts = artifact_url.rsplit("#", maxsplit=1)
+        if len(url_parts) == 2 and url_parts[1].startswith("sha256="):
+            _LOGGER.debug("Using SHA256 stated in URL: %r", url_parts[1])
+            return url_parts[1][len("sha256=") :]
+
+        return None
+
+    def _get_known_sha(self) -> Optional[str]:
+        """Get SHA256 of the artifact if known without downloading the artifact."""
+        return self._sha or self._get_sha_from_url(self.artifact_url)
+
+    @staticmethod
+    def _check_downloaded_digest(artifact_url: str, stated: Optional[str], computed: str) -> str:
+        """Check digest computed when downloading an artifact matches the one stated, return the digest to use."""
+        _LOGGER.debug("Computed artifact sha256 digest for %r: %s", artifact_url, computed)
+        if stated is not None and stated != computed:
+            raise ArtifactDigestMismatchError(
+                f"Digest of artifact downloaded from {artifact_url!r} ({computed}) does not match "
+                f"the one stated ({stated})"
+            )
+
+        return computed
+
+    def _take_stored(self, store: Optional[ArtifactStore]) -> bool:
+        """Take the artifact from the given artifact store if it was stored there before, return True if taken."""
+        if store is None:
+            return False
+
+        digest = self._get_known_sha() or store.get_digest(self.artifact_url)
+        self._store_file = store.get(digest) if digest else None
+        if self._store_file is None:
+            return False
+
+        self.compressed_file = self._store_file.name
+        self._sha = digest
+        # Artifacts are verified before they are added to the store.
+        self._sha_verified = True
+        return True
+
+    def _create_download_file(self, store: Optional[ArtifactStore]) -> IO[bytes]:
+        """Create a file to download the artifact to, in the given artifact store if configured."""
+        if store is not None:
+            f = store.temporary_file()
+        else:
+            f = tempfile.NamedTemporaryFile(mode="w+b", delete=False)
+
+        self._temporary_paths.append(f.name)
+        return f
+
+    def _use_downloaded(self, store: Optional[ArtifactStore], path: str, digest: str) -> None:
+        """Use the downloaded file with the given computed digest as the artifact, add it to the store if configured.
+
+        The downloaded file is not used (and removed with the instance) if it does not match the digest stated.
+        """
+        self._sha = self._check_downloaded_digest(self.artifact_url, self._sha, digest)
+        self._sha_verified = True
+
+        if store is not None:
+            self._temporary_paths.remove(path)
+            self._store_file = store.add(path, self._sha, url=self.artifact_url)
+            self.compressed_file = self._store_file.name
+        else:
+            self.compressed_file = path
+
+    def __del__(self) -> None:
+        """Remove temporary files created by class, other files (e.g. in the artifact store) are kept."""
+        store_file = getattr(self, "_store_file", None)
+        if store_file is not None:
+            store_file.close()
+
+        for path in getattr(self, "_temporary_paths", []):
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except Exception:
+                pass
 
 
 @attr.s(slots=True)
-class Artifact:
+class Artifact(_ArtifactFiles):
     """Python artifacts are compressed modules."""
 
     artifact_name = attr.ib(type=str)
@@ -41,11 +198,17 @@ class Artifact:
     compressed_file = attr.ib(type=str, default=None)
     dir_name = attr.ib(type=str, default=None)
     verify_ssl = attr.ib(type=bool, default=False)
-    sha = attr.ib(type=str, default=None)
+    _sha = attr.ib(type=Optional[str], default=None)
+    # The artifact read remotely, False if the server does not support Range requests.
+    _remote_file = attr.ib(type=Any, default=None, init=False, repr=False, eq=False)
+
+    @property
+    def sha(self) -> str:
+        """Get SHA256 of the artifact, computed lazily as it can require downloading the artifact."""
+        if self._sha is None:
+            self._sha = self._calculate_sha()
 
-    def __attrs_post_init__(self):
-        """Initialize sha after init."""
-        self.sha = self._calculate_sha()
+        return self._sha
 
     def _download_if_necessary(self):
         if self.compressed_file is None:
@@ -57,12 +220,28 @@ class Artifact:
             self._extract_py_module()
 
     def _download_artifact(self) -> None:
+        """Download the artifact, compute its SHA256 while downloading.
+
+        If the artifact store is configured, the artifact is taken from the store if it was downloaded before
+        and stored there otherwise. If not configured, the artifact is downloaded to a temporary file.
+        """
+        store = get_artifact_store()
+        if self._take_stored(store):
+            return
+
         _LOGGER.debug("Downloading artifact from url %r", self.artifact_url)
-        response = requests.get(self.artifact_url, verify=self.verify_ssl, stream=True)
-        response.raise_for_status()
-        with tempfile.NamedTemporaryFile(mode="w+b", delete=False) as f:
-            self.compressed_file = f.name
-            f.write(response.content)
+        digest = hashlib.sha256()
+        response = get_session().get(self.artifact_url, verify=self.verify_ssl, stream=True)
+        try:
+            response.raise_for_status()
+            with self._create_download_file(store) as f:
+                for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+        finally:
+            response.close()
+
+        self._use_downloaded(store, f.name, digest.hexdigest())
 
     def _extract_py_module(self) -> None:
 
@@ -70,16 +249,16 @@ class Artifact:
 
         try:
             self.dir_name = tempfile.mkdtemp()
+            self._temporary_paths.append(self.dir_name)
             try:
-                if self.compressed_file.endswith(".tar.gz"):
-                    tf = tarfile.open(self.compressed_file)
-                    tf.extractall(self.dir_name)
-                    _LOGGER.debug("Artifact is .tar.gz file")
+                if not self._is_zip():
+                    with tarfile.open(self.compressed_file) as tf:
+                        tf.extractall(self.dir_name)
+                    _LOGGER.debug("Artifact is a tarball")
                 else:
-                    ext = self.compressed_file.split(".")[-1]
                     with zipfile.ZipFile(self.compressed_file) as zip_ref:
                         zip_ref.extractall(self.dir_name)
-                        _LOGGER.debug("Artifact is .%r file", ext)
+                    _LOGGER.debug("Artifact is a zip archive")
             except Exception as e:
                 _LOGGER.exception(f"Could not extract {self.compressed_file}: {str(e)}")
         except Exception as exc:
@@ -87,30 +266,52 @@ class Artifact:
 
     def _calculate_sha(self) -> str:
         """Calculate SHA256 of compressed file if not present in url."""
-        url_parts = self.artifact_url.rsplit("#", maxsplit=1)
-        if len(url_parts) == 2 and url_parts[1].startswith("sha256="):
-            sha256 = url_parts[1][len("sha256=") :]
-            _LOGGER.debug("Using SHA256 stated in URL: %r", url_parts[1])
+        sha256 = self._get_sha_from_url(self.artifact_url)
+        if sha256 is not None:
             return sha256
 
-        self._download_if_necessary()
+        if self.compressed_file is None:
+            # The digest is computed while downloading.
+            self._download_artifact()
+            return self._sha  # type: ignore
 
+        self._sha_verified = True
         with open(self.compressed_file, "rb") as f:
             digest = hashlib.sha256()
-            chunk = 1024
             while True:
-                data = f.read(chunk)
+                data = f.read(_CHUNK_SIZE)
                 if data:
                     digest.update(data)
                 else:
                     break
 
         hex_digest = digest.hexdigest()
-        _LOGGER.debug("Computed artifact sha256 digest for %r: %s", self.artifact_url, digest)
+        _LOGGER.debug("Computed artifact sha256 digest for %r: %s", self.artifact_url, hex_digest)
         return hex_digest
 
+    def _get_stored_result(self, kind: str, compute: Callable[[], Any]) -> Any:
+        """Get result of the given kind from the result store if configured, compute and store it if not stored.
+
+        The result store is looked up only if the digest is known without downloading the artifact.
+        """
+        store = get_result_store()
+        if store is None:
+            return compute()
+
+        sha = self.sha if self.compressed_file is not None else self._get_known_sha()
+        result = store.get(sha, kind) if sha is not None else None
+        if result is None:
+            result = compute()
+            if result is not None and self._sha_verified:
+                store.put(self.sha, kind, result)
+            elif result is not None:
+                _LOGGER.debug("Not storing %s result of %r, digest was not verified", kind, self.artifact_name)
+
+        return result
+
     #                       VERSIONED SYMBOLS                                #
-    def _elf_find_versioned_symbols(self, elf: ELFFile) -> Iterator[Tuple[str, str]]:
+    @staticmethod
+    def _elf_find_versioned_symbols(elf: ELFFile) -> Iterator[Tuple[str, str]]:
         """Take an ELFFile object and outputs the required dynamic symbols."""
         section = elf.get_section_by_name(".gnu.version_r")
 
@@ -121,59 +322,445 @@ class Artifact:
                 for vernaux in verneed_iter:
                     yield verneed.name, vernaux.name
 
-    def _is_elf(self, filename: str) -> bool:
-        """Check if files magic numbers are <delete>ELF."""
-        with open(filename, "rb") as f:
-            return f.read(16).startswith(b"\x7f\x45\x4c\x46")
+    @staticmethod
+    def _may_be_elf(filepath: str) -> bool:
+        """Check if the given file can be an ELF object based on its path, to avoid inspecting its content."""
+        if any(part.endswith((".dist-info", ".egg-info")) for part in filepath.split(os.sep)[:-1]):
+            return False
 
-    def _get_versioned_symbols_from_file(self, result, filename: str):
-        """Given a file get all required dynamic symbols if it's an executable."""
-        with open(filename, "rb") as f:
-            if not self._is_elf(filename):
-                return
-            elf = ELFFile(f)
-            for lib, sym in self._elf_find_versioned_symbols(elf):
+        return not filepath.lower().endswith(_NON_ELF_SUFFIXES)
+
+    @staticmethod
+    def _add_versioned_symbols(
+        result: Dict[str, Set[str]], elf_file: IO[bytes], filepath: str, artifact_name: str
+    ) -> None:
+        """Add dynamic symbols required by the given seekable ELF object to the result."""
+        try:
+            elf = ELFFile(elf_file)
+            for lib, sym in Artifact._elf_find_versioned_symbols(elf):
                 if result.get(lib) is None:
                     result[lib] = set()
                 result[lib].add(sym)
+        except ELFError as exc:
+            _LOGGER.warning("Failed to parse ELF object %r in %r: %s", filepath, artifact_name, str(exc))
 
-    def get_versioned_symbols(self) -> dict:
-        """Walk dir and get all dynamic symbols required from all files."""
-        self._extract_if_necessary()
-        result = dict()  # type: Any
-        for dir_name, _, file_list in os.walk(self.dir_name):
-            for fname in file_list:
-                self._get_versioned_symbols_from_file(result, os.path.join(dir_name, fname))
+    @staticmethod
+    def _get_versioned_symbols_from_file(result: Dict[str, Set[str]], filename: str, artifact_name: str) -> None:
+        """Given a file get all required dynamic symbols if it's an executable."""
+        with open(filename, "rb") as f:
+            if f.read(len(_ELF_MAGIC)) != _ELF_MAGIC:
+                return
+            f.seek(0)
+            Artifact._add_versioned_symbols(result, f, filename, artifact_name)
 
-        for symbol in result:
-            result[symbol] = list(result[symbol])
+    @staticmethod
+    def _get_versioned_symbols_from_stream(
+        result: Dict[str, Set[str]], stream: IO[bytes], filepath: str, artifact_name: str
+    ) -> None:
+        """Given a stream of an archive member get all required dynamic symbols if it's an executable."""
+        magic = stream.read(len(_ELF_MAGIC))
+        if magic != _ELF_MAGIC:
+            return
 
-        return result
+        # ELF parsing needs random access, spool only real ELF objects, bigger ones to disk.
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE) as elf_file:
+            elf_file.write(magic)
+            shutil.copyfileobj(stream, elf_file, _CHUNK_SIZE)
+            elf_file.seek(0)
+            Artifact._add_versioned_symbols(result, elf_file, filepath, artifact_name)  # type: ignore
+
+    def get_versioned_symbols(self, in_archive: bool = True, max_workers: Optional[int] = None) -> dict:
+        """Get all dynamic symbols required from all ELF objects present in the artifact.
+
+        By default, only files which can be ELF objects based on their path and magic number are taken from
+        the artifact, without extracting it. If in_archive is set to False, the artifact is extracted to a
+        temporary directory first.
+
+        If max_workers is set, ELF objects are parsed in a pool of processes. Tarballs are always inspected
+        sequentially when not extracted as they cannot be read at random positions.
+
+        If the result store is configured, results are stored and reused for artifacts with the same digest.
+        """
+        return self._get_stored_result(  # type: ignore
+            "symbols" if in_archive else "symbols-extracted",
+            lambda: self._compute_versioned_symbols(in_archive, max_workers),
+        )
+
+    def _compute_versioned_symbols(self, in_archive: bool, max_workers: Optional[int]) -> dict:
+        """Get all dynamic symbols required from all ELF objects present in the artifact, see get_versioned_symbols."""
+        result = dict()  # type: Dict[str, Set[str]]
+        parallel = max_workers is not None and max_workers > 1
+        if in_archive and parallel and self._is_zip():
+            members = [(info, info.file_size) for info in self._list_zip_members(self._may_be_elf)]
+            batches = _partition_members(members, max_workers)  # type: ignore
+            partial_results = _run_batches(
+                ProcessPoolExecutor(max_workers=max_workers),
+                _scan_zip_members,
+                [(self.compressed_file, self.artifact_name, batch) for batch in batches],
+            )
+            for partial_result in partial_results:
+                _merge_versioned_symbols(result, partial_result)
+        elif in_archive:
+            for filepath, member in self._iter_archive_members(self._may_be_elf):
+                self._get_versioned_symbols_from_stream(result, member, filepath, self.artifact_name)
+        else:
+            filepaths = [
+                (filepath, os.path.getsize(filepath))
+                for filepath in self._list_extracted_files()
+                if self._may_be_elf(filepath[len(self.dir_name) + 1 :])
+            ]
+            if parallel:
+                batches = _partition_members(filepaths, max_workers)  # type: ignore
+                partial_results = _run_batches(
+                    ProcessPoolExecutor(max_workers=max_workers),
+                    _scan_files,
+                    [(self.artifact_name, batch) for batch in batches],
+                )
+                for partial_result in partial_results:
+                    _merge_versioned_symbols(result, partial_result)
+            else:
+                for filepath, _ in filepaths:
+                    self._get_versioned_symbols_from_file(result, filepath, self.artifact_name)
+
+        # Sort symbols so that results do not depend on the order in which ELF objects were inspected.
+        return {lib: sorted(symbols) for lib, symbols in result.items()}
 
     #                          Package Digests                                          #
-    def gather_hashes(self) -> list:
-        """Calculate checksums and gather hashes of all file in the given artifact."""
+    def _is_zip(self) -> bool:
+        """Check if the downloaded artifact is a zip archive, other artifacts are treated as tarballs."""
+        self._download_if_necessary()
+        return zipfile.is_zipfile(self.compressed_file)
+
+    def _list_zip_members(self, path_filter: Optional[Callable[[str], bool]] = None) -> List[zipfile.ZipInfo]:
+        """List files stored in the artifact which is a zip archive, in the archive order.
+
+        If a path filter is given, only files with paths accepted by the filter are listed.
+        """
+        with zipfile.ZipFile(self.compressed_file) as zip_ref:
+            return [
+                info
+                for info in zip_ref.infolist()
+                if not info.is_dir() and (path_filter is None or path_filter(os.path.normpath(info.filename)))
+            ]
+
+    def _list_extracted_files(self) -> List[str]:
+        """Extract the artifact if not extracted yet and list paths to all the files extracted."""
         self._extract_if_necessary()
 
-        digests = []
+        result = []
         for root, _, files in os.walk(self.dir_name):
             for file_ in files:
                 filepath = os.path.join(root, file_)
                 if os.path.isfile(filepath):
-                    with open(filepath, "rb") as my_file:
-                        digests.append(
-                            {
-                                "filepath": filepath[len(self.dir_name) + 1 :],
-                                "sha256": hashlib.sha256(my_file.read()).hexdigest(),
-                            }
-                        )
-        return digests
-
-    def __del__(self):
-        """Remove temporary file created by class."""
-        try:
-            if self.compressed_file.startswith("/tmp"):
-                os.remove(self.compressed_file)
-            shutil.rmtree(self.dir_name)
-        except Exception:
-            pass
+                    result.append(filepath)
+
+        return result
+
+    def _iter_archive_members(
+        self, path_filter: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[Tuple[str, IO[bytes]]]:
+        """Iterate over files stored in the artifact as streams, without extracting the artifact.
+
+        If a path filter is given, only files with paths accepted by the filter are opened.
+        """
+        if self._is_zip():
+            with zipfile.ZipFile(self.compressed_file) as zip_ref:
+                for info in self._list_zip_members(path_filter):
+                    with zip_ref.open(info) as member:
+                        yield os.path.normpath(info.filename), member
+        else:
+            with tarfile.open(self.compressed_file) as tf:
+                for tar_info in tf:
+                    if not (tar_info.isfile() or tar_info.issym() or tar_info.islnk()):
+                        continue
+                    filepath = os.path.normpath(tar_info.name)
+                    if path_filter is not None and not path_filter(filepath):
+                        continue
+                    try:
+                        # Links are resolved to the content of files they point to, as when extracted.
+                        tar_member = tf.extractfile(tar_info)
+                    except KeyError:
+                        _LOGGER.debug("Skipping dangling link %r in %r", tar_info.name, self.artifact_name)
+                        continue
+                    if tar_member is None:
+                        continue
+                    with tar_member:
+                        yield filepath, tar_member
+
+    def _get_zip_source(self) -> Optional[Union[str, IO[bytes]]]:
+        """Get the artifact to be opened as a zip archive, return None if the artifact is not a zip archive.
+
+        If the artifact was not downloaded yet, it is read remotely if the server supports Range requests and the
+        artifact is a zip archive. Otherwise, the artifact is downloaded.
+        """
+        if self.compressed_file is None and self.artifact_url:
+            if self._remote_file is None:
+                self._remote_file = RemoteFile.open(self.artifact_url, verify=self.verify_ssl) or False
+
+            if self._remote_file and zipfile.is_zipfile(self._remote_file):
+                return self._remote_file  # type: ignore
+
+        return self.compressed_file if self._is_zip() else None
+
+    def list_members(self) -> List[str]:
+        """List paths to files stored in the artifact.
+
+        Zip archives (wheels) are read remotely using HTTP Range requests if the artifact was not downloaded yet
+        and the server supports them, only the central directory of the archive is transferred then. Other
+        artifacts are downloaded.
+        """
+        zip_source = self._get_zip_source()
+        if zip_source is not None:
+            with zipfile.ZipFile(zip_source) as zip_ref:
+                return [os.path.normpath(info.filename) for info in zip_ref.infolist() if not info.is_dir()]
+
+        with tarfile.open(self.compressed_file) as tf:
+            return [
+                os.path.normpath(tar_info.name)
+                for tar_info in tf
+                if tar_info.isfile() or tar_info.issym() or tar_info.islnk()
+            ]
+
+    def read_member(self, name: str) -> bytes:
+        """Read content of the given file stored in the artifact, only the file is transferred if read remotely.
+
+        See list_members for more info on how the artifact is accessed.
+        """
+        name = os.path.normpath(name)
+        zip_source = self._get_zip_source()
+        if zip_source is not None:
+            with zipfile.ZipFile(zip_source) as zip_ref:
+                for info in zip_ref.infolist():
+                    if not info.is_dir() and os.path.normpath(info.filename) == name:
+                        return zip_ref.read(info)
+        else:
+            for _, member in self._iter_archive_members(lambda filepath: filepath == name):
+                return member.read()
+
+        raise NotFoundError(f"File {name!r} not found in artifact {self.artifact_name!r}")
+
+    def read_metadata(self) -> bytes:
+        """Read core metadata of the artifact - METADATA file of wheels or PKG-INFO file of source distributions.
+
+        See list_members for more info on how the artifact is accessed.
+        """
+        for filepath in self.list_members():
+            parts = filepath.split(os.sep)
+            if len(parts) == 2 and (
+                (parts[0].endswith(".dist-info") and parts[1] == "METADATA") or parts[1] == "PKG-INFO"
+            ):
+                return self.read_member(filepath)
+
+        raise NotFoundError(f"No core metadata found in artifact {self.artifact_name!r}")
+
+    @staticmethod
+    def _hash_stream(stream: IO[bytes]) -> str:
+        """Compute SHA256 of the given stream, read in chunks."""
+        digest = hashlib.sha256()
+        while True:
+            data = stream.read(_CHUNK_SIZE)
+            if not data:
+                break
+            digest.update(data)
+
+        return digest.hexdigest()
+
+    def gather_hashes(
+        self,
+        in_archive: bool = True,
+        max_workers: Optional[int] = None,
+        use_record: bool = False,
+        record_sample_size: int = 0,
+    ) -> list:
+        """Calculate checksums and gather hashes of all file in the given artifact.
+
+        By default, files are hashed as streamed from the artifact. If in_archive is set to False, the artifact is
+        extracted to a temporary directory first.
+
+        If max_workers is set, files are hashed in a pool of threads, hashlib and zlib release the GIL while
+        processing larger chunks of data. Tarballs are always hashed sequentially when not extracted as they
+        cannot be read at random positions. Hashes are reported in the same order regardless of max_workers.
+
+        If use_record is set, digests of files stored in wheels are taken from the RECORD file, only files not
+        listed there are hashed. Wheels are read remotely if possible, see list_members. If record_sample_size
+        is set, the given number of randomly chosen files is hashed to verify the RECORD file. Files are hashed
+        as if use_record was not set if the artifact has no RECORD file or the RECORD file does not match.
+
+        If the result store is configured, results are stored and reused for artifacts with the same digest.
+        """
+        if use_record:
+            result = self._get_stored_result(
+                "hashes-record", lambda: self._gather_hashes_from_record(record_sample_size)
+            )
+            if result is not None:
+                return result  # type: ignore
+
+        return self._get_stored_result(  # type: ignore
+            "hashes" if in_archive else "hashes-extracted",
+            lambda: self._compute_hashes(in_archive, max_workers),
+        )
+
+    @staticmethod
+    def _parse_record(content: bytes) -> Dict[str, str]:
+        """Parse the given RECORD file of a wheel, return files with their SHA256 digests in hex."""
+        result = {}
+        for row in csv.reader(io.StringIO(content.decode("utf-8"))):
+            if len(row) < 2 or not row[1]:
+                continue
+
+            algorithm, _, digest = row[1].partition("=")
+            if algorithm != "sha256":
+                continue
+
+            # Digests are urlsafe-base64-encoded without padding, see PEP-376 and PEP-427.
+            result[os.path.normpath(row[0])] = base64.urlsafe_b64decode(digest + "=" * (-len(digest) % 4)).hex()
+
+        return result
+
+    def _gather_hashes_from_record(self, sample_size: int) -> Optional[list]:
+        """Gather hashes of all files in a wheel based on its RECORD file, return None if not possible."""
+        zip_source = self._get_zip_source()
+        if zip_source is None:
+            _LOGGER.debug("Artifact %r is not a wheel, RECORD file cannot be used", self.artifact_name)
+            return None
+
+        with zipfile.ZipFile(zip_source) as zip_ref:
+            members = [(os.path.normpath(info.filename), info) for info in zip_ref.infolist() if not info.is_dir()]
+            record_paths = [
+                filepath
+                for filepath, _ in members
+                if os.path.basename(filepath) == "RECORD" and os.path.dirname(filepath).endswith(".dist-info")
+            ]
+            if len(record_paths) != 1:
+                _LOGGER.debug("No single RECORD file found in %r: %r", self.artifact_name, record_paths)
+                return None
+
+            def hash_member(info: zipfile.ZipInfo) -> str:
+                with zip_ref.open(info) as member:
+                    return self._hash_stream(member)
+
+            record_path = record_paths[0]
+            try:
+                digests = self._parse_record(zip_ref.read(dict(members)[record_path]))
+            except (ValueError, csv.Error) as exc:
+                _LOGGER.warning("Failed to parse RECORD file of %r: %s", self.artifact_name, str(exc))
+                return None
+
+            listed = [(filepath, info) for filepath, info in members if filepath in digests]
+            for filepath, info in random.sample(listed, min(sample_size, len(listed))):
+                if hash_member(info) != digests[filepath]:
+                    _LOGGER.warning(
+                        "Digest of %r does not match the one stated in RECORD file of %r, hashing all files",
+                        filepath,
+                        self.artifact_name,
+                    )
+                    return None
+
+            # The RECORD file itself and files such as signatures of the RECORD file are not listed with digests.
+            return [
+                {"filepath": filepath, "sha256": digests[filepath] if filepath in digests else hash_member(info)}
+                for filepath, info in members
+            ]
+
+    def _compute_hashes(self, in_archive: bool, max_workers: Optional[int]) -> list:
+        """Calculate checksums and gather hashes of all file in the given artifact, see gather_hashes."""
+        parallel = max_workers is not None and max_workers > 1
+        if in_archive and parallel and self._is_zip():
+            members = [(info, info.file_size) for info in self._list_zip_members()]
+            batches = _partition_members(members, max_workers)  # type: ignore
+            partial_results = _run_batches(
+                ThreadPoolExecutor(max_workers=max_workers),
+                _hash_zip_members,
+                [(self.compressed_file, batch) for batch in batches],
+            )
+            return [record for _, record in sorted(item for partial in partial_results for item in partial)]
+
+        if in_archive:
+            return [
+                {"filepath": filepath, "sha256": self._hash_stream(member)}
+                for filepath, member in self._iter_archive_members()
+            ]
+
+        filepaths = self._list_extracted_files()
+        if parallel:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                digests = list(executor.map(_hash_file, filepaths))
+        else:
+            digests = [_hash_file(filepath) for filepath in filepaths]
+
+        return [
+            {"filepath": filepath[len(self.dir_name) + 1 :], "sha256": digest}
+            for filepath, digest in zip(filepaths, digests)
+        ]
+
+
+def _partition_members(items: List[Tuple[Any, int]], parts: int) -> List[List[Tuple[int, Any]]]:
+    """Split items with their sizes into at most the given number of batches of a similar total size.
+
+    Items are kept together with their original position so that results can be merged in the original order.
+    """
+    batches = [[] for _ in range(parts)]  # type: List[List[Tuple[int, Any]]]
+    batch_sizes = [0] * parts
+    # Assign biggest items first, each to the least loaded batch.
+    for index, (item, size) in sorted(enumerate(items), key=lambda indexed: indexed[1][1], reverse=True):
+        smallest = batch_sizes.index(min(batch_sizes))
+        batches[smallest].append((index, item))
+        batch_sizes[smallest] += size
+
+    return [batch for batch in batches if batch]
+
+
+def _run_batches(executor: Executor, func: Callable[..., Any], batch_args: List[Tuple[Any, ...]]) -> List[Any]:
+    """Run the given function on each batch in the executor, results are returned in the order of batches."""
+    with executor:
+        futures = [executor.submit(func, *args) for args in batch_args]
+        return [future.result() for future in futures]
+
+
+def _hash_file(filepath: str) -> str:
+    """Compute SHA256 of the given file."""
+    with open(filepath, "rb") as f:
+        return Artifact._hash_stream(f)
+
+
+def _hash_zip_members(archive_path: str, batch: List[Tuple[int, zipfile.ZipInfo]]) -> List[Tuple[int, dict]]:
+    """Hash the given members of a zip archive, run in a worker with its own handle to the archive."""
+    result = []
+    with zipfile.ZipFile(archive_path) as zip_ref:
+        for index, info in batch:
+            with zip_ref.open(info) as member:
+                result.append(
+                    (index, {"filepath": os.path.normpath(info.filename), "sha256": Artifact._hash_stream(member)})
+                )
+
+    return result
+
+
+def _scan_zip_members(
+    archive_path: str, artifact_name: str, batch: List[Tuple[int, zipfile.ZipInfo]]
+) -> Dict[str, Set[str]]:
+    """Get dynamic symbols required by the given members of a zip archive, run in a worker process."""
+    result = {}  # type: Dict[str, Set[str]]
+    with zipfile.ZipFile(archive_path) as zip_ref:
+        for _, info in batch:
+            with zip_ref.open(info) as member:
+                Artifact._get_versioned_symbols_from_stream(
+                    result, member, os.path.normpath(info.filename), artifact_name
+                )
+
+    return result
+
+
+def _scan_files(artifact_name: str, batch: List[Tuple[int, str]]) -> Dict[str, Set[str]]:
+    """Get dynamic symbols required by the given extracted files, run in a worker process."""
+    result = {}  # type: Dict[str, Set[str]]
+    for _, filepath in batch:
+        Artifact._get_versioned_symbols_from_file(result, filepath, artifact_name)
+
+    return result
+
+
+def _merge_versioned_symbols(result: Dict[str, Set[str]], partial_result: Dict[str, Set[str]]) -> None:
+    """Merge dynamic symbols found by a worker into the result."""
+    for lib, symbols in partial_result.items():
+        result.setdefault(lib, set()).update(symbols)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Listing of artifacts available for a package on a package source index."""
+
+import sys
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import attr
+from packaging.version import parse as parse_version
+
+from .cache import estimate_size
+
+
+@attr.s(slots=True)
+class ArtifactListing:
+    """Artifacts of a package listed on a package source index, indexed by their parsed version.
+
+    Each artifact is described by a dictionary with at least "name", "url" and "version" keys, the listing is
+    retrieved once and then used to answer queries on versions and artifacts of the package.
+
+    Indexes which track releases (such as Warehouse) can also state released versions, including versions
+    which have no artifacts available.
+    """
+
+    package_name = attr.ib(type=str)
+    artifacts = attr.ib(type=List[Dict[str, Any]])
+    release_versions = attr.ib(type=Optional[List[str]], default=None)
+    _index = attr.ib(type=dict, init=False, repr=False, eq=False)
+
+    def __attrs_post_init__(self) -> None:
+        """Index artifacts by their parsed version."""
+        self._index = {}
+        for version in self.release_versions or []:
+            self._index.setdefault(parse_version(version), [])
+
+        for artifact in self.artifacts:
+            self._index.setdefault(parse_version(artifact["version"]), []).append(artifact)
+
+    def versions(self) -> List[str]:
+        """Get versions available, as stated by the index or in artifact names."""
+        if self.release_versions is not None:
+            return list(self.release_versions)
+
+        result = {}  # type: Dict[str, None]
+        for artifact in self.artifacts:
+            result[artifact["version"]] = None
+
+        return list(result)
+
+    def has_version(self, package_version: str) -> bool:
+        """Check if the given version is present in the listing."""
+        return parse_version(package_version) in self._index
+
+    def get_artifacts(self, package_version: str) -> List[Dict[str, Any]]:
+        """Get artifacts available for the given version."""
+        return list(self._index.get(parse_version(package_version), []))
+
+    def __sizeof__(self) -> int:
+        """Estimate memory consumed by the listing."""
+        return object.__sizeof__(self) + estimate_size(self.artifacts) + sys.getsizeof(self._index)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A content-addressed on-disk store of downloaded artifacts shared across processes."""
+
+import hashlib
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import attr
+
+from .configuration import config
+from .exceptions import UnsupportedConfigurationError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # File locking is not available on all platforms, the artifact store cannot be used there.
+    fcntl = None  # type: ignore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@attr.s(slots=True)
+class ArtifactStore:
+    """Store artifacts on disk keyed by their SHA256 digest.
+
+    Artifacts are stored under "objects" directory, URLs artifacts were downloaded from are mapped to their
+    digests under "urls" directory so that artifacts with a digest not known upfront are not downloaded again.
+    The store can be safely used by multiple processes - artifacts are atomically moved into the store and
+    eviction is serialized using a file lock. Once the store exceeds its size limit, least recently used
+    artifacts are removed. Artifacts are handed out as open files holding a shared lock, an artifact is not
+    evicted while such a file is open so that it can be accessed by its path in the meantime.
+    """
+
+    root = attr.ib(type=str)
+    max_bytes = attr.ib(type=Optional[int], default=None)
+
+    def __attrs_post_init__(self) -> None:
+        """Check the artifact store can be used on this platform."""
+        if fcntl is None:
+            raise UnsupportedConfigurationError(
+                "The artifact store requires file locking not available on this platform"
+            )
+
+    def _object_path(self, digest: str) -> str:
+        """Get path to an artifact with the given digest."""
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def _url_path(self, url: str) -> str:
+        """Get path to a file mapping the given URL to an artifact digest."""
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.root, "urls", key[:2], key)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the store, shared with other processes using the same store."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _open_pinned(path: str) -> Optional[IO[bytes]]:
+        """Open the given stored artifact and hold a shared lock preventing its eviction, None if not stored."""
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+        fcntl.flock(f, fcntl.LOCK_SH)
+        if os.fstat(f.fileno()).st_nlink == 0:
+            # Evicted before the lock was acquired.
+            f.close()
+            return None
+
+        return f
+
+    def get(self, digest: str) -> Optional[IO[bytes]]:
+        """Get the stored artifact with the given digest, return None if not stored.
+
+        The artifact is returned as an open file with its path available as name, the artifact is not evicted
+        until the file is closed.
+        """
+        path = self._object_path(digest)
+        f = self._open_pinned(path)
+        if f is None:
+            return None
+
+        # Mark the artifact as recently used for eviction.
+        os.utime(path)
+        _LOGGER.debug("Using artifact %s from the artifact store", digest)
+        return f
+
+    def get_digest(self, url: str) -> Optional[str]:
+        """Get digest of an artifact previously downloaded from the given URL, return None if not known."""
+        try:
+            with open(self._url_path(url)) as url_file:
+                return url_file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def temporary_file(self) -> IO[bytes]:
+        """Create a temporary file in the store which can be later added using the add method."""
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        return tempfile.NamedTemporaryFile(mode="w+b", dir=tmp_dir, delete=False)
+
+    def add(self, path: str, digest: str, url: Optional[str] = None) -> IO[bytes]:
+        """Move the given file into the store under the given digest, return the stored artifact as in get.
+
+        The file should be created using the temporary_file method so that it is atomically moved into the store.
+        """
+        object_path = self._object_path(digest)
+        f = self.get(digest)
+        if f is not None:
+            # Already stored by another process, the stored artifact is kept as it can be in use.
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            with open(path, "rb") as new_file:
+                # The lock follows the file moved into the store, it cannot be evicted in the meantime.
+                fcntl.flock(new_file, fcntl.LOCK_SH)
+                os.replace(path, object_path)
+                f = self._open_pinned(object_path)
+
+        if url is not None:
+            url_path = self._url_path(url)
+            os.makedirs(os.path.dirname(url_path), exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(url_path), delete=False) as url_file:
+                url_file.write(digest)
+            os.replace(url_file.name, url_path)
+
+        if self.max_bytes is not None:
+            self.evict()
+
+        return f  # type: ignore
+
+    def _list_objects(self) -> List[Tuple[float, int, str]]:
+        """List stored artifacts with their last access time and size."""
+        result = []
+        for root, _, files in os.walk(os.path.join(self.root, "objects")):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                result.append((stat.st_mtime, stat.st_size, path))
+
+        return result
+
+    @staticmethod
+    def _remove_unused(path: str) -> bool:
+        """Remove the given stored artifact unless it is in use, return True if it is not stored anymore."""
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return True
+
+        with f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                _LOGGER.debug("Artifact %r is in use, not evicting it", path)
+                return False
+
+            _LOGGER.debug("Evicting artifact %r from the artifact store", path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        return True
+
+    def evict(self) -> int:
+        """Remove least recently used artifacts to fit into the size limit, return number of artifacts removed.
+
+        Artifacts in use are not removed.
+        """
+        if self.max_bytes is None:
+            return 0
+
+        removed = 0
+        with self._lock():
+            objects = sorted(self._list_objects())
+            total_size = sum(size for _, size, _ in objects)
+            for _, size, path in objects:
+                if total_size <= self.max_bytes:
+                    break
+
+                if self._remove_unused(path):
+                    total_size -= size
+                    removed += 1
+
+        return removed
+
+
+def get_artifact_store() -> Optional[ArtifactStore]:
+    """Get the artifact store if configured."""
+    if config.artifact_store_dir is None:
+        return None
+
+    return ArtifactStore(config.artifact_store_dir, max_bytes=config.artifact_store_max_bytes)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""An in-process cache for results of queries to package source indexes."""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+
+import attr
+
+from .configuration import config
+
+_LOGGER = logging.getLogger(__name__)
+
+# A marker of a value not found in the cache.
+_MISSING = object()
+
+
+class CacheKey(NamedTuple):
+    """A key of a cached query."""
+
+    source_url: str
+    source_options: Tuple[Any, ...]
+    package_name: Optional[str]
+    method: str
+    arguments: Tuple[Any, ...]
+
+
+@attr.s(slots=True)
+class CacheStatistics:
+    """Statistics of cache usage."""
+
+    hits = attr.ib(type=int, default=0)
+    stale_hits = attr.ib(type=int, default=0)
+    misses = attr.ib(type=int, default=0)
+    evictions = attr.ib(type=int, default=0)
+    expirations = attr.ib(type=int, default=0)
+    invalidations = attr.ib(type=int, default=0)
+    refresh_failures = attr.ib(type=int, default=0)
+    coalesced = attr.ib(type=int, default=0)
+
+
+@attr.s(slots=True)
+class _CacheEntry:
+    """A value stored in the cache."""
+
+    value = attr.ib(type=Any)
+    size = attr.ib(type=int)
+    created = attr.ib(type=float)
+
+
+def estimate_size(obj: Any) -> int:
+    """Estimate memory consumed by the given object including objects it references."""
+    seen = set()
+    to_visit = [obj]
+    size = 0
+    while to_visit:
+        item = to_visit.pop()
+        if id(item) in seen:
+            continue
+
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            to_visit.extend(item.keys())
+            to_visit.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            to_visit.extend(item)
+
+    return size
+
+
+class Cache:
+    """A thread-safe LRU cache bounded by the estimated memory consumed by the stored values.
+
+    Entries can expire after the configured time to live. If stale-while-revalidate is configured, an expired
+    entry is still served for the given time while it is refreshed in background.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: Optional[float] = None,
+        stale_while_revalidate: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache with the given limits, times are stated in seconds."""
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.statistics = CacheStatistics()
+        self._clock = clock
+        self._entries = OrderedDict()  # type: OrderedDict[CacheKey, _CacheEntry]
+        self._size = 0
+        self._refreshing = set()  # type: set
+        # Computations in progress done by coroutines, shared by concurrent requests for the same key.
+        self._in_flight = {}  # type: Dict[CacheKey, Tuple[asyncio.AbstractEventLoop, asyncio.Future]]
+        self._lock = threading.RLock()
+
+    @property
+    def size(self) -> int:
+        """Get estimated size of all the values stored in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Get number of entries stored."""
+        return len(self._entries)
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove the given entry, the lock has to be held."""
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        """Store the given value and evict least recently used entries to fit into the memory limit."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            _LOGGER.debug("Not caching result of %r, its size %d exceeds cache size limit", key, size)
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            while self._entries and self._size + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.statistics.evictions += 1
+
+            self._entries[key] = _CacheEntry(value=value, size=size, created=self._clock())
+            self._size += size
+
+    def _refresh(self, key: CacheKey, compute: Callable[[], Any]) -> None:
+        """Refresh the given entry, keep the stale value on failures."""
+        try:
+            self._store(key, compute())
+        except Exception as exc:
+            _LOGGER.warning("Failed to refresh cached result of %r: %s", key, str(exc))
+            with self._lock:
+                self.statistics.refresh_failures += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _refresh_async(self, key: CacheKey, compute: Callable[[], Awaitable[Any]]) -> None:
+        """Refresh the given entry using a coroutine, keep the stale value on failures."""
+        try:
+            self._store(key, await compute())
+        except Exception as exc:
+            _LOGGER.warning("Failed to refresh cached result of %r: %s", key, str(exc))
+            with self._lock:
+                self.statistics.refresh_failures += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _lookup(self, key: CacheKey) -> Tuple[Any, bool]:
+        """Look up the given key, the lock has to be held.
+
+        Return the value stored or _MISSING if not available and a flag whether the value should be refreshed.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.created
+            if self.ttl is None or age <= self.ttl:
+                self._entries.move_to_end(key)
+                self.statistics.hits += 1
+                return entry.value, False
+
+            if self.stale_while_revalidate and age <= self.ttl + self.stale_while_revalidate:
+                self._entries.move_to_end(key)
+                self.statistics.stale_hits += 1
+                refresh = key not in self._refreshing
+                self._refreshing.add(key)
+                return entry.value, refresh
+
+            self._remove(key)
+            self.statistics.expirations += 1
+
+        self.statistics.misses += 1
+        return _MISSING, False
+
+    def get_or_compute(self, key: CacheKey, compute: Callable[[], Any]) -> Any:
+        """Get the cached value for the given key, compute and cache it if not available."""
+        with self._lock:
+            value, refresh = self._lookup(key)
+            if refresh:
+                threading.Thread(target=self._refresh, args=(key, compute), daemon=True).start()
+
+        if value is not _MISSING:
+            return value
+
+        # Compute outside of the lock so that other queries are not blocked by network access.
+        value = compute()
+        self._store(key, value)
+        return value
+
+    async def get_or_compute_async(self, key: CacheKey, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Get the cached value for the given key, compute and cache it using the given coroutine if not available.
+
+        Concurrent requests for the same key done in an event loop are coalesced into a single computation.
+        """
+        with self._lock:
+            value, refresh = self._lookup(key)
+
+        if refresh:
+            asyncio.ensure_future(self._refresh_async(key, compute))
+
+        if value is not _MISSING:
+            return value
+
+        loop = asyncio.get_event_loop()
+        while True:
+            with self._lock:
+                in_flight = self._in_flight.get(key)
+                if in_flight is None or in_flight[0] is not loop:
+                    future = loop.create_future()
+                    self._in_flight[key] = (loop, future)
+                    break
+
+                self.statistics.coalesced += 1
+
+            try:
+                return await asyncio.shield(in_flight[1])
+            except asyncio.CancelledError:
+                if not in_flight[1].cancelled():
+                    raise
+                # The computation was cancelled by its caller, compute the value instead.
+
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved, there might be nobody waiting for it.
+            future.exception()
+            raise
+        else:
+            self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                if self._in_flight.get(key, (None, None))[1] is future:
+                    del self._in_flight[key]
+
+    def invalidate(self, source_url: Optional[str] = None, package_name: Optional[str] = None) -> int:
+        """Invalidate entries for the given source URL and/or package, invalidate all entries if none given.
+
+        Return number of entries invalidated.
+        """
+        with self._lock:
+            to_remove = [
+                key
+                for key in self._entries
+                if (source_url is None or key.source_url == source_url)
+                and (package_name is None or key.package_name == package_name)
+            ]
+            for key in to_remove:
+                self._remove(key)
+
+            self.statistics.invalidations += len(to_remove)
+            return len(to_remove)
+
+    def clear(self) -> None:
+        """Remove all the entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.statistics = CacheStatistics()
+
+
+cache = Cache(
+    max_bytes=config.cache_max_bytes,
+    ttl=config.cache_ttl,
+    stale_while_revalidate=config.cache_stale_while_revalidate,
+)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A memory efficient immutable set of package names."""
+
+import sys
+from array import array
+from collections.abc import Set
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+
+class CompactPackageSet(Set):
+    """A memory efficient immutable set of package names.
+
+    Names are kept sorted in a single string together with a table of offsets, membership checks are done
+    using a binary search. Compared to a built-in set, there is no per-name object and hash table overhead.
+    """
+
+    __slots__ = ("_data", "_offsets")
+
+    def __init__(self, names: Iterable[str]):
+        """Create the set out of the given names, duplicates are discarded."""
+        sorted_names = sorted(names)
+
+        offsets = array("L", [0])
+        parts = []
+        last = None
+        for name in sorted_names:
+            if name == last:
+                continue
+
+            parts.append(name)
+            offsets.append(offsets[-1] + len(name))
+            last = name
+
+        self._data = "".join(parts)
+        self._offsets = offsets
+
+    def _get(self, idx: int) -> str:
+        """Get name stored at the given position."""
+        return self._data[self._offsets[idx] : self._offsets[idx + 1]]
+
+    def __len__(self) -> int:
+        """Get number of names stored."""
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over names stored in a sorted order."""
+        for idx in range(len(self)):
+            yield self._get(idx)
+
+    def __contains__(self, item: Any) -> bool:
+        """Check if the given name is stored."""
+        if not isinstance(item, str):
+            return False
+
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            name = self._get(middle)
+            if name == item:
+                return True
+
+            if name < item:
+                low = middle + 1
+            else:
+                high = middle
+
+        return False
+
+    def __sizeof__(self) -> int:
+        """Get memory consumed by the set including the stored names."""
+        return object.__sizeof__(self) + sys.getsizeof(self._data) + sys.getsizeof(self._offsets)
+
+    def __repr__(self) -> str:
+        """Get a textual representation of the set."""
+        return f"{self.__class__.__name__}({list(self)!r})"
@@ -18,6 +18,7 @@
 """Configuration used for computing recommendations."""
 
 import os
+from typing import Optional
 
 import attr
 
@@ -30,9 +31,39 @@ class _Configuration:
 
     Accepted environment variables:
       * THOTH_PYTHON_WAREHOUSES - a JSON describing warehouses
+      * THOTH_PYTHON_HTTP_POOL_CONNECTIONS - number of per-host connection pools kept by the shared HTTP session
+      * THOTH_PYTHON_HTTP_POOL_MAXSIZE - number of connections kept alive in each connection pool
+      * THOTH_PYTHON_HTTP_POOL_MAXSIZE_PER_HOST - comma separated host=size pairs overriding the pool size per host
+      * THOTH_PYTHON_HTTP_CACHE_DIR - directory with cached index responses, the cache is disabled if not set
+      * THOTH_PYTHON_CACHE_MAX_BYTES - memory limit for results of index queries cached in-process
+      * THOTH_PYTHON_CACHE_TTL - time in seconds after which cached results expire, no expiration if not set
+      * THOTH_PYTHON_CACHE_STALE_WHILE_REVALIDATE - time in seconds expired results are served while refreshed
+      * THOTH_PYTHON_ARTIFACT_STORE_DIR - directory with downloaded artifacts, artifacts are not kept if not set
+      * THOTH_PYTHON_ARTIFACT_STORE_MAX_BYTES - disk space limit for the artifact store, no limit if not set
+      * THOTH_PYTHON_RESULT_STORE_PATH - path to an SQLite database with results of artifact analyses
+      * THOTH_PYTHON_OFFLOAD_MIN_BYTES - minimal size of a document parsed outside of the asyncio event loop
+      * THOTH_PYTHON_RETRY_MAX_RETRIES - number of retries of requests failing on transient errors
+      * THOTH_PYTHON_RETRY_BACKOFF_FACTOR - base of the exponential backoff between retries in seconds
+      * THOTH_PYTHON_RETRY_MAX_BACKOFF - maximum backoff between retries in seconds
+      * THOTH_PYTHON_RETRY_BUDGET - time in seconds after which a failing request is not retried anymore
     """
 
     warehouses = attr.ib(type=list)
+    http_pool_connections = attr.ib(type=int)
+    http_pool_maxsize = attr.ib(type=int)
+    http_pool_maxsize_per_host = attr.ib(type=dict)
+    http_cache_dir = attr.ib(type=Optional[str])
+    cache_max_bytes = attr.ib(type=int)
+    cache_ttl = attr.ib(type=Optional[float])
+    cache_stale_while_revalidate = attr.ib(type=Optional[float])
+    artifact_store_dir = attr.ib(type=Optional[str])
+    artifact_store_max_bytes = attr.ib(type=Optional[int])
+    result_store_path = attr.ib(type=Optional[str])
+    offload_min_bytes = attr.ib(type=int)
+    retry_max_retries = attr.ib(type=int)
+    retry_backoff_factor = attr.ib(type=float)
+    retry_max_backoff = attr.ib(type=float)
+    retry_budget = attr.ib(type=float)
 
     @warehouses.default
     def warehouses_default(self):
@@ -42,5 +73,76 @@ class _Configuration:
 
         return warehouses
 
+    @http_pool_connections.default
+    def http_pool_connections_default(self):
+        return int(os.getenv("THOTH_PYTHON_HTTP_POOL_CONNECTIONS", 10))
+
+    @http_pool_maxsize.default
+    def http_pool_maxsize_default(self):
+        return int(os.getenv("THOTH_PYTHON_HTTP_POOL_MAXSIZE", 10))
+
+    @http_pool_maxsize_per_host.default
+    def http_pool_maxsize_per_host_default(self):
+        result = {}
+        for entry in os.getenv("THOTH_PYTHON_HTTP_POOL_MAXSIZE_PER_HOST", "").split(","):
+            if not entry.strip():
+                continue
+
+            host, size = entry.split("=", maxsplit=1)
+            result[host.strip()] = int(size)
+
+        return result
+
+    @http_cache_dir.default
+    def http_cache_dir_default(self):
+        return os.getenv("THOTH_PYTHON_HTTP_CACHE_DIR") or None
+
+    @cache_max_bytes.default
+    def cache_max_bytes_default(self):
+        return int(os.getenv("THOTH_PYTHON_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+    @cache_ttl.default
+    def cache_ttl_default(self):
+        ttl = os.getenv("THOTH_PYTHON_CACHE_TTL")
+        return float(ttl) if ttl else None
+
+    @cache_stale_while_revalidate.default
+    def cache_stale_while_revalidate_default(self):
+        stale_while_revalidate = os.getenv("THOTH_PYTHON_CACHE_STALE_WHILE_REVALIDATE")
+        return float(stale_while_revalidate) if stale_while_revalidate else None
+
+    @artifact_store_dir.default
+    def artifact_store_dir_default(self):
+        return os.getenv("THOTH_PYTHON_ARTIFACT_STORE_DIR") or None
+
+    @artifact_store_max_bytes.default
+    def artifact_store_max_bytes_default(self):
+        max_bytes = os.getenv("THOTH_PYTHON_ARTIFACT_STORE_MAX_BYTES")
+        return int(max_bytes) if max_bytes else None
+
+    @result_store_path.default
+    def result_store_path_default(self):
+        return os.getenv("THOTH_PYTHON_RESULT_STORE_PATH") or None
+
+    @offload_min_bytes.default
+    def offload_min_bytes_default(self):
+        return int(os.getenv("THOTH_PYTHON_OFFLOAD_MIN_BYTES", 32 * 1024))
+
+    @retry_max_retries.default
+    def retry_max_retries_default(self):
+        return int(os.getenv("THOTH_PYTHON_RETRY_MAX_RETRIES", 5))
+
+    @retry_backoff_factor.default
+    def retry_backoff_factor_default(self):
+        return float(os.getenv("THOTH_PYTHON_RETRY_BACKOFF_FACTOR", 0.5))
+
+    @retry_max_backoff.default
+    def retry_max_backoff_default(self):
+        return float(os.getenv("THOTH_PYTHON_RETRY_MAX_BACKOFF", 30))
+
+    @retry_budget.default
+    def retry_budget_default(self):
+        return float(os.getenv("THOTH_PYTHON_RETRY_BUDGET", 120))
+
 
 config = _Configuration()
@@ -33,6 +33,10 @@ class DigestsFetcherBase:
         """Fetch digests for the given package in specified version from the given package index."""
         raise NotImplementedError
 
+    def fetch_digests_many(self, packages: typing.List[typing.Tuple[str, str]]) -> typing.List[dict]:
+        """Fetch digests for the given package name and version pairs, reports are returned in the same order."""
+        return [self.fetch_digests(package_name, package_version) for package_name, package_version in packages]
+
 
 class PythonDigestsFetcher(DigestsFetcherBase):
     """Fetch digests from the given PEP-503 compatible package source index."""
@@ -55,3 +59,21 @@ class PythonDigestsFetcher(DigestsFetcherBase):
                 )
 
         return report
+
+    def fetch_digests_many(self, packages: typing.List[typing.Tuple[str, str]]) -> typing.List[dict]:
+        """Fetch digests for the given package name and version pairs, querying each source concurrently."""
+        reports = [{} for _ in packages]  # type: typing.List[dict]
+
+        for source in self._sources:
+            for report, result in zip(reports, source.get_package_hashes_many(packages)):
+                if result.error is None:
+                    report[source.url] = result.hashes
+                elif isinstance(result.error, NotFoundError):
+                    _LOGGER.debug(
+                        f"Package {result.package_name} in version {result.package_version} not "
+                        f"found on index {source.name}: {str(result.error)}"
+                    )
+                else:
+                    raise result.error
+
+        return reports
@@ -65,6 +65,10 @@ class NotFoundError(ThothPythonExceptionError):
     """Raised if the given artifact cannot be found."""
 
 
+class ArtifactDigestMismatchError(ThothPythonExceptionError):
+    """Raised if content of a downloaded artifact does not match the digest stated for it."""
+
+
 class HTTPError(ThothPythonExceptionError):
     """Raised if the given Http url doesn't exists."""
 
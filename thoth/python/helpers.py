@@ -47,27 +47,47 @@ def fill_package_digests(generated_project: "Project") -> "Project":
     """Temporary fill package digests stated in Pipfile.lock."""
     if generated_project.pipfile_lock is None:
         raise ValueError("Generated project PipfileLock is not set.")
+
+    indexed = {}  # type: Dict[Source, List[PackageVersion]]
+    not_indexed = []
     for package_version in chain(generated_project.pipfile_lock.packages, generated_project.pipfile_lock.dev_packages):
         if package_version.hashes:
             # Already filled from the last run.
             continue
 
         if package_version.index:
-            scanned_hashes = package_version.index.get_package_hashes(
-                package_version.name, package_version.locked_version
-            )
+            indexed.setdefault(package_version.index, []).append(package_version)
         else:
-            for source in generated_project.pipfile.meta.sources.values():
-                try:
-                    scanned_hashes = source.get_package_hashes(package_version.name, package_version.locked_version)
-                    break
-                except Exception:
-                    continue
-            else:
-                raise ValueError("Unable to find package hashes")
+            not_indexed.append(package_version)
+
+    for index, package_versions in indexed.items():
+        results = index.get_package_hashes_many([(pv.name, pv.locked_version) for pv in package_versions])
+        for package_version, result in zip(package_versions, results):
+            if result.error is not None:
+                raise result.error
+
+            for entry in result.hashes or []:
+                package_version.hashes.append("sha256:" + entry["sha256"])
+
+    # Packages without an explicit index are looked up on the configured sources in order.
+    for source in generated_project.pipfile.meta.sources.values():
+        if not not_indexed:
+            break
+
+        results = source.get_package_hashes_many([(pv.name, pv.locked_version) for pv in not_indexed])
+        remaining = []
+        for package_version, result in zip(not_indexed, results):
+            if result.error is not None:
+                remaining.append(package_version)
+                continue
+
+            for entry in result.hashes or []:
+                package_version.hashes.append("sha256:" + entry["sha256"])
+
+        not_indexed = remaining
 
-        for entry in scanned_hashes:
-            package_version.hashes.append("sha256:" + entry["sha256"])
+    if not_indexed:
+        raise ValueError("Unable to find package hashes")
 
     return generated_project
 
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""On-disk cache of index responses revalidated using ETag and Last-Modified validators."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+import attr
+import requests
+
+from .configuration import config
+from .session import get_session
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bump if the shape of parsed data stored in the cache changes.
+_CACHE_FORMAT_VERSION = 3
+
+
+@attr.s(slots=True)
+class HTTPCache:
+    """Cache parsed responses on disk together with their validators.
+
+    Cached entries are always revalidated against the server using conditional requests. If the server
+    responds with "304 Not Modified", the previously parsed data are returned so that neither the response
+    body is transferred nor parsed again.
+    """
+
+    cache_dir = attr.ib(type=str)
+
+    def _entry_path(self, kind: str, url: str) -> str:
+        """Get path to a cache entry for the given URL."""
+        key = hashlib.sha256(f"{_CACHE_FORMAT_VERSION}:{kind}:{url}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    @staticmethod
+    def _load_entry(path: str) -> Optional[Dict[str, Any]]:
+        """Load the given cache entry, return None if not present or not readable."""
+        try:
+            with open(path) as entry_file:
+                return json.load(entry_file)  # type: ignore
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            _LOGGER.warning("Ignoring unreadable HTTP cache entry %r: %s", path, str(exc))
+            return None
+
+    @staticmethod
+    def _store_entry(path: str, entry: Dict[str, Any]) -> None:
+        """Atomically store the given cache entry so that concurrent readers never see a partial write."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False) as entry_file:
+                json.dump(entry, entry_file)
+            os.replace(entry_file.name, path)
+        except OSError as exc:
+            _LOGGER.warning("Failed to store HTTP cache entry %r: %s", path, str(exc))
+
+    def get(
+        self,
+        url: str,
+        *,
+        kind: str,
+        parse: Callable[[requests.Response], Any],
+        verify: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """Retrieve parsed content of the given URL, revalidate a cached copy if any.
+
+        The parse callback is called with the response if the content was not cached or has changed, it is
+        also responsible for reporting any HTTP errors. Data returned by the callback must be serializable
+        to JSON.
+        """
+        path = self._entry_path(kind, url)
+        entry = self._load_entry(path)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = get_session().get(url, verify=verify, headers=request_headers)
+        if entry is not None and response.status_code == 304:
+            _LOGGER.debug("Content of %r was not modified, using cached data", url)
+            return entry["data"]
+
+        data = parse(response)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            self._store_entry(path, {"url": url, "etag": etag, "last_modified": last_modified, "data": data})
+
+        return data
+
+
+def cached_get(
+    url: str,
+    *,
+    kind: str,
+    parse: Callable[[requests.Response], Any],
+    verify: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+) -> Any:
+    """Retrieve parsed content of the given URL using the HTTP cache if configured."""
+    if config.http_cache_dir is None:
+        return parse(get_session().get(url, verify=verify, headers=headers))
+
+    return HTTPCache(config.http_cache_dir).get(url, kind=kind, parse=parse, verify=verify, headers=headers)
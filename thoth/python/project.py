@@ -535,13 +535,19 @@ class Project:
         if self.pipfile_lock is None:
             raise ValueError("PipfileLock was not provided and has value None.")
 
+        package_versions = {}  # type: Dict[str, PackageVersion]
         for package_version in chain(self.pipfile_lock.packages, self.pipfile_lock.dev_packages):
-            if package_version.name in report:
+            if package_version.name in package_versions:
                 # TODO: can we have the same package in dev packages and packages?
                 _LOGGER.warning(f"Package {package_version.name} already present in the report")
                 continue
 
-            index_report = digests_fetcher.fetch_digests(package_version.name, package_version.locked_version)
+            package_versions[package_version.name] = package_version
+
+        index_reports = digests_fetcher.fetch_digests_many(
+            [(package_version.name, package_version.locked_version) for package_version in package_versions.values()]
+        )
+        for package_version, index_report in zip(package_versions.values(), index_reports):
             findings.extend(self._check_scan(package_version, index_report))
             report[package_version.name] = index_report
 
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A read-only seekable file served over HTTP, read using Range requests."""
+
+import io
+import logging
+import re
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from .exceptions import HTTPError
+from .session import get_session
+
+_LOGGER = logging.getLogger(__name__)
+
+# Size of the tail requested when opening the file, zip archives keep their central directory at the end.
+_TAIL_SIZE = 64 * 1024
+# Minimal size of a range requested, small reads done by zipfile are served from data read ahead.
+_READ_AHEAD_SIZE = 256 * 1024
+# Number of ranges retrieved kept in memory.
+_MAX_SEGMENTS = 8
+
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class RemoteFile(io.RawIOBase):
+    """A read-only seekable file served over HTTP.
+
+    Only ranges of the file which are actually read are transferred, ranges retrieved are kept in memory so that
+    subsequent small reads do not issue additional requests.
+    """
+
+    def __init__(self, url: str, size: int, verify: bool = True, tail: bytes = b"") -> None:
+        """Initialize the file of the given size, the tail of the file can be passed if already retrieved."""
+        super().__init__()
+        self.url = url
+        self.size = size
+        self.verify = verify
+        self._position = 0
+        self._segments = []  # type: List[Tuple[int, bytes]]
+        if tail:
+            self._segments.append((size - len(tail), tail))
+
+    @classmethod
+    def open(cls, url: str, verify: bool = True) -> Optional["RemoteFile"]:
+        """Open the file at the given URL, return None if the server does not support Range requests."""
+        response = get_session().get(url, verify=verify, headers={"Range": f"bytes=-{_TAIL_SIZE}"}, stream=True)
+        try:
+            if response.status_code != 206:
+                _LOGGER.debug("Server does not support Range requests for %r (status %d)", url, response.status_code)
+                return None
+
+            match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+            if not match:
+                _LOGGER.debug("Unexpected Content-Range %r served for %r", response.headers.get("Content-Range"), url)
+                return None
+
+            tail = response.content
+        finally:
+            response.close()
+
+        return cls(url, int(match.group(3)), verify=verify, tail=tail)
+
+    def readable(self) -> bool:
+        """Check if the file is readable."""
+        return True
+
+    def seekable(self) -> bool:
+        """Check if the file is seekable."""
+        return True
+
+    def tell(self) -> int:
+        """Get the current position in the file."""
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Change the current position in the file."""
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence {whence!r}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+
+        self._position = position
+        return position
+
+    def _fetch(self, start: int, length: int) -> bytes:
+        """Retrieve the given range of the file."""
+        end = min(start + length, self.size) - 1
+        _LOGGER.debug("Retrieving bytes %d-%d of %r", start, end, self.url)
+        response = get_session().get(self.url, verify=self.verify, headers={"Range": f"bytes={start}-{end}"})
+        if response.status_code != 206:
+            raise HTTPError(
+                f"Failed to retrieve bytes {start}-{end} of {self.url!r}, server responded with {response.status_code}"
+            )
+
+        return response.content  # type: ignore
+
+    def _read_at(self, position: int, size: int) -> bytes:
+        """Read data of the given size at the given position, use ranges retrieved if possible."""
+        parts = []
+        end = min(position + size, self.size)
+        while position < end:
+            for start, data in self._segments:
+                if start <= position < start + len(data):
+                    part = data[position - start : end - start]
+                    break
+            else:
+                part = self._fetch(position, max(end - position, _READ_AHEAD_SIZE))
+                if not part:
+                    break
+                self._segments.append((position, part))
+                if len(self._segments) > _MAX_SEGMENTS:
+                    # The tail holding the central directory is kept.
+                    self._segments.pop(1 if self._segments[0][0] + len(self._segments[0][1]) == self.size else 0)
+                part = part[: end - position]
+
+            parts.append(part)
+            position += len(part)
+
+        return b"".join(parts)
+
+    def readinto(self, buffer) -> int:  # type: ignore
+        """Read data into the given buffer, return number of bytes read."""
+        data = self._read_at(self._position, len(buffer))
+        buffer[: len(data)] = data
+        self._position += len(data)
+        return len(data)
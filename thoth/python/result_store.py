@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A persistent store of results of artifact analyses keyed by artifact digest."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from .configuration import config
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bump if the shape of results stored changes.
+_RESULT_FORMAT_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    sha256 TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (sha256, kind)
+) WITHOUT ROWID
+"""
+
+
+class ResultStore:
+    """Store results of artifact analyses in an SQLite database.
+
+    Content of an artifact never changes for a given digest, so results are stored without any expiration.
+    The database runs in WAL mode so that readers are not blocked by writers, it can be shared by multiple
+    threads and processes - each thread of a process uses its own connection.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the store backed by the database at the given path, the database is created if needed."""
+        self.path = path
+        self._local = threading.local()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get a connection owned by the current thread of the current process."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+
+        return connection  # type: ignore
+
+    @staticmethod
+    def _kind(kind: str) -> str:
+        """Get kind as stored in the database."""
+        return f"{_RESULT_FORMAT_VERSION}:{kind}"
+
+    def get(self, sha256: str, kind: str) -> Optional[Any]:
+        """Get result of the given kind stored for an artifact with the given digest, return None if not stored."""
+        try:
+            row = (
+                self._get_connection()
+                .execute("SELECT value FROM results WHERE sha256 = ? AND kind = ?", (sha256, self._kind(kind)))
+                .fetchone()
+            )
+        except sqlite3.Error as exc:
+            _LOGGER.warning("Failed to query result store %r: %s", self.path, str(exc))
+            return None
+
+        if row is None:
+            return None
+
+        _LOGGER.debug("Using stored %s result for artifact %s", kind, sha256)
+        return json.loads(row[0])
+
+    def put(self, sha256: str, kind: str, value: Any) -> None:
+        """Store result of the given kind for the artifact digest, the value has to be JSON serializable."""
+        try:
+            connection = self._get_connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO results (sha256, kind, value, created) VALUES (?, ?, ?, ?)",
+                    (sha256, self._kind(kind), json.dumps(value), time.time()),
+                )
+        except sqlite3.Error as exc:
+            _LOGGER.warning("Failed to store result in result store %r: %s", self.path, str(exc))
+
+
+_RESULT_STORES = {}  # type: Dict[str, ResultStore]
+_RESULT_STORES_LOCK = threading.Lock()
+
+
+def get_result_store() -> Optional[ResultStore]:
+    """Get the result store if configured."""
+    path = config.result_store_path
+    if path is None:
+        return None
+
+    with _RESULT_STORES_LOCK:
+        if path not in _RESULT_STORES:
+            _RESULT_STORES[path] = ResultStore(path)
+
+        return _RESULT_STORES[path]
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A retry policy for idempotent requests shared by synchronous and asynchronous HTTP transports."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import FrozenSet
+from typing import Optional
+
+import aiohttp
+import attr
+import requests
+
+from .configuration import config
+
+_LOGGER = logging.getLogger(__name__)
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Errors which are not transient even though raised as connection errors by some of the libraries.
+_PERMANENT_ERRORS = (
+    requests.exceptions.SSLError,
+    requests.exceptions.InvalidURL,
+    requests.exceptions.InvalidSchema,
+    requests.exceptions.MissingSchema,
+)
+_PERMANENT_ASYNC_ERRORS = (aiohttp.ClientSSLError, aiohttp.ClientConnectorCertificateError, aiohttp.InvalidURL)
+
+
+@attr.s(slots=True)
+class RetryStatistics:
+    """Statistics of requests retried."""
+
+    retries = attr.ib(type=int, default=0)
+    status_retries = attr.ib(type=int, default=0)
+    error_retries = attr.ib(type=int, default=0)
+    exhausted = attr.ib(type=int, default=0)
+    sleep_seconds = attr.ib(type=float, default=0.0)
+
+
+class RetryPolicy:
+    """Retry idempotent requests failing on transient errors using exponential backoff with full jitter.
+
+    Requests are retried on connection errors, timeouts and on responses with a status signalizing a transient
+    failure, TLS errors and invalid URLs are never retried. A delay requested by the server using Retry-After
+    header is honored. Retries of a request stop once the maximum number of retries is reached or once the next
+    attempt would exceed the time budget measured from the first attempt.
+    """
+
+    def __init__(
+        self,
+        max_retries: int,
+        backoff_factor: float,
+        max_backoff: float,
+        budget: float,
+        retry_statuses: FrozenSet[int] = _RETRY_STATUSES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the policy, times are stated in seconds."""
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.retry_statuses = retry_statuses
+        self.statistics = RetryStatistics()
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_idempotent(method: str) -> bool:
+        """Check if requests using the given HTTP method can be retried."""
+        return method.upper() in _RETRY_METHODS
+
+    @staticmethod
+    def _parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+        """Parse value of Retry-After header stating either seconds or an HTTP date, return None if not valid."""
+        if not retry_after:
+            return None
+
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            date = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            _LOGGER.debug("Ignoring invalid Retry-After header %r", retry_after)
+            return None
+
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+
+        return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def get_delay(self, attempt: int, started: float, retry_after: Optional[str] = None) -> Optional[float]:
+        """Get delay before the next attempt of a request started at the given time, None if not to be retried."""
+        if attempt >= self.max_retries:
+            return None
+
+        delay = self._parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**attempt))
+
+        if self._clock() - started + delay > self.budget:
+            return None
+
+        return delay
+
+    def _record_retry(self, delay: float, error: bool) -> None:
+        """Record a retry in statistics."""
+        with self._lock:
+            self.statistics.retries += 1
+            self.statistics.sleep_seconds += delay
+            if error:
+                self.statistics.error_retries += 1
+            else:
+                self.statistics.status_retries += 1
+
+    def _record_exhausted(self) -> None:
+        """Record a request given up after retries."""
+        with self._lock:
+            self.statistics.exhausted += 1
+
+    def _next_delay(
+        self, attempt: int, started: float, url: str, reason: str, retry_after: Optional[str]
+    ) -> Optional[float]:
+        """Get delay before the next attempt and log it, None if the request is not to be retried."""
+        delay = self.get_delay(attempt, started, retry_after)
+        if delay is None:
+            if attempt > 0:
+                _LOGGER.warning("Giving up request to %r after %d retries: %s", url, attempt, reason)
+                self._record_exhausted()
+            return None
+
+        _LOGGER.warning("Retrying request to %r in %.2f seconds: %s", url, delay, reason)
+        return delay
+
+    def call(self, url: str, request: Callable[[], requests.Response]) -> requests.Response:
+        """Perform a request to the given URL using requests, retry it on transient failures.
+
+        The last response is returned if retries are exhausted so that the caller handles its status.
+        """
+        started = self._clock()
+        attempt = 0
+        while True:
+            try:
+                response = request()
+            except _PERMANENT_ERRORS:
+                raise
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                delay = self._next_delay(attempt, started, url, str(exc), None)
+                if delay is None:
+                    raise
+                self._record_retry(delay, error=True)
+            else:
+                if response.status_code not in self.retry_statuses:
+                    return response
+
+                reason = f"server responded with {response.status_code}"
+                delay = self._next_delay(attempt, started, url, reason, response.headers.get("Retry-After"))
+                if delay is None:
+                    return response
+                response.close()
+                self._record_retry(delay, error=False)
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(
+        self, url: str, request: Callable[[], Awaitable[aiohttp.ClientResponse]]
+    ) -> aiohttp.ClientResponse:
+        """Perform a request to the given URL using aiohttp, retry it on transient failures, see call."""
+        started = self._clock()
+        attempt = 0
+        while True:
+            try:
+                response = await request()
+            except _PERMANENT_ASYNC_ERRORS:
+                raise
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                delay = self._next_delay(attempt, started, url, str(exc) or type(exc).__name__, None)
+                if delay is None:
+                    raise
+                self._record_retry(delay, error=True)
+            else:
+                if response.status not in self.retry_statuses:
+                    return response
+
+                reason = f"server responded with {response.status}"
+                delay = self._next_delay(attempt, started, url, reason, response.headers.get("Retry-After"))
+                if delay is None:
+                    return response
+                response.release()
+                self._record_retry(delay, error=False)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def reset_statistics(self) -> None:
+        """Reset statistics of requests retried."""
+        with self._lock:
+            self.statistics = RetryStatistics()
+
+
+retry_policy = RetryPolicy(
+    max_retries=config.retry_max_retries,
+    backoff_factor=config.retry_backoff_factor,
+    max_backoff=config.retry_max_backoff,
+    budget=config.retry_budget,
+)
+
+
+@asynccontextmanager
+async def retrying_get(
+    session: aiohttp.ClientSession, url: str, **kwargs: Any
+) -> AsyncIterator[aiohttp.ClientResponse]:
+    """Perform a GET request using the given aiohttp session retried according to the retry policy.
+
+    Error statuses are raised as aiohttp.ClientResponseError once retries are exhausted.
+    """
+    response = await retry_policy.call_async(url, lambda: session.get(url, **kwargs))
+    try:
+        response.raise_for_status()
+        yield response
+    finally:
+        response.release()
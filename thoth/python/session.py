@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# thoth-python
+# Copyright(C) 2023 Red Hat, Inc.
+#
+# This program is free software: you can redistribute it and / or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""A shared HTTP session with pooled keep-alive connections used when talking to package indexes."""
+
+import atexit
+import logging
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .configuration import config
+from .retry import retry_policy
+
+_LOGGER = logging.getLogger(__name__)
+
+_SESSION = None  # type: Optional[requests.Session]
+_SESSION_LOCK = threading.Lock()
+
+
+class _RetryingSession(requests.Session):
+    """A session retrying idempotent requests on transient failures according to the shared retry policy."""
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:  # type: ignore
+        """Perform the request, retry it if it is idempotent."""
+        if not retry_policy.is_idempotent(method):
+            return super().request(method, url, *args, **kwargs)
+
+        return retry_policy.call(url, lambda: super(_RetryingSession, self).request(method, url, *args, **kwargs))
+
+
+def _create_session() -> requests.Session:
+    """Create a new session with connection pools sized based on configuration."""
+    session = _RetryingSession()
+
+    adapter = HTTPAdapter(pool_connections=config.http_pool_connections, pool_maxsize=config.http_pool_maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    # Requests picks the adapter with the longest matching prefix, host specific pools take precedence.
+    for host, pool_maxsize in config.http_pool_maxsize_per_host.items():
+        _LOGGER.debug("Using connection pool of size %d for host %r", pool_maxsize, host)
+        host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        session.mount(f"http://{host}/", host_adapter)
+        session.mount(f"https://{host}/", host_adapter)
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the session shared by all package sources, create one if not created yet."""
+    global _SESSION
+
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _LOGGER.debug("Creating a shared HTTP session")
+                _SESSION = _create_session()
+
+    return _SESSION
+
+
+def close_session() -> None:
+    """Close the shared session and release pooled connections.
+
+    A new session is transparently created on the next call to get_session().
+    """
+    global _SESSION
+
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _LOGGER.debug("Closing the shared HTTP session")
+            _SESSION.close()
+            _SESSION = None
+
+
+def _reset_session_after_fork() -> None:
+    """Drop the session inherited from the parent process, its sockets belong to the parent."""
+    global _SESSION, _SESSION_LOCK
+
+    _SESSION = None
+    _SESSION_LOCK = threading.Lock()
+
+
+atexit.register(close_session)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session_after_fork)
@@ -17,19 +17,24 @@
 
 """Representation of source (index) for Python packages."""
 
+import email
+import hashlib
+import json
 import logging
 import re
-from functools import lru_cache
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import unquote
 from urllib.parse import urljoin
 from urllib.parse import urlparse
 from datetime import datetime
 
-from typing import Optional, List, Union, Generator, Dict
+from typing import Any, Callable, Optional, List, Iterable, Tuple, Union, Generator, Dict
 
 import attr
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
 from packaging.version import Version
 from packaging.version import LegacyVersion
 from packaging.version import parse as parse_version
@@ -40,11 +45,40 @@ from .exceptions import InternalError
 from .exceptions import VersionIdentifierError
 from .configuration import config
 from .artifact import Artifact
+from .artifact_listing import ArtifactListing
+from .cache import cache
+from .cache import CacheKey
+from .compact_set import CompactPackageSet
+from .http_cache import cached_get
+from .session import get_session
 
 from thoth.common.helpers import parse_datetime
 
 _LOGGER = logging.getLogger(__name__)
+_STREAM_CHUNK_SIZE = 64 * 1024
 LEGACY_URLS = {"https://pypi.python.org/simple": "https://pypi.org/simple"}
+SIMPLE_API_JSON_CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+# Prefer JSON based simple API (PEP-691), fall back to HTML if not offered by the index.
+SIMPLE_API_ACCEPT = f"{SIMPLE_API_JSON_CONTENT_TYPE}, application/vnd.pypi.simple.v1+html;q=0.2, text/html;q=0.01"
+# Core metadata fields which can be stated multiple times, reported as lists (PEP-566).
+_MULTIPLE_USE_METADATA_FIELDS = frozenset(
+    (
+        "platform",
+        "supported_platform",
+        "classifier",
+        "requires_dist",
+        "requires_external",
+        "project_url",
+        "provides_extra",
+        "provides_dist",
+        "obsoletes_dist",
+        "license_file",
+        "dynamic",
+        "requires",
+        "provides",
+        "obsoletes",
+    )
+)
 
 
 def normalize_url(url: str) -> str:
@@ -55,6 +89,91 @@ def normalize_url(url: str) -> str:
     return url
 
 
+def _create_cache_key(source: Any, method: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> CacheKey:
+    """Create a key identifying result of the given method called on the given source with the given arguments.
+
+    The first positional argument, if it is a string, is treated as a package name to support invalidation per
+    package.
+    """
+    package_name = source.normalize_package_name(args[0]) if args and isinstance(args[0], str) else None
+    return CacheKey(
+        source_url=source.url,
+        source_options=(source.verify_ssl, source.warehouse, source.warehouse_api_url),
+        package_name=package_name,
+        method=method.__qualname__,
+        arguments=args + tuple(sorted(kwargs.items())),
+    )
+
+
+def _cached(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Cache results of the decorated Source method in the shared in-process cache."""
+
+    @functools.wraps(method)
+    def wrapper(self: "Source", *args: Any, **kwargs: Any) -> Any:
+        key = _create_cache_key(self, method, args, kwargs)
+        return cache.get_or_compute(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+class _PackageLinkTarget:
+    """A parser target collecting package names from links on the root simple repository listing."""
+
+    def __init__(self, parse_package_link: Callable[[str, str], Optional[str]]) -> None:
+        """Initialize the target with a callback turning a link into a package name."""
+        self._parse_package_link = parse_package_link
+        self._package_names = []  # type: List[str]
+        self._href = None  # type: Optional[str]
+        self._text = []  # type: List[str]
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        """Start a new element."""
+        if tag == "a":
+            self._href = attrib.get("href")
+            self._text = []
+
+    def data(self, data: str) -> None:
+        """Accumulate text of the current link."""
+        if self._href is not None:
+            self._text.append(data)
+
+    def end(self, tag: str) -> None:
+        """Finish an element, record the package name if it was a link to a package."""
+        if tag == "a" and self._href is not None:
+            package_name = self._parse_package_link(self._href, "".join(self._text))
+            if package_name:
+                self._package_names.append(package_name)
+            self._href = None
+
+    def close(self) -> None:
+        """Finish parsing."""
+
+    def pop_package_names(self) -> List[str]:
+        """Retrieve package names parsed so far."""
+        result = self._package_names
+        self._package_names = []
+        return result
+
+
+@attr.s(frozen=True, slots=True)
+class PackageHashesResult:
+    """Hashes of a package in a specific version, or an error if they could not be obtained."""
+
+    package_name = attr.ib(type=str)
+    package_version = attr.ib(type=str)
+    hashes = attr.ib(type=Optional[list], default=None)
+    error = attr.ib(type=Optional[Exception], default=None)
+
+
+@attr.s(frozen=True, slots=True)
+class PackageVersionsResult:
+    """Versions of a package, or an error if they could not be obtained."""
+
+    package_name = attr.ib(type=str)
+    versions = attr.ib(type=Optional[List[str]], default=None)
+    error = attr.ib(type=Optional[Exception], default=None)
+
+
 @attr.s(frozen=True, slots=True)
 class Source:
     """Representation of source (Python index) for Python packages."""
@@ -117,6 +236,13 @@ class Source:
 
         return result
 
+    def invalidate_cache(self, package_name: Optional[str] = None) -> int:
+        """Invalidate cached results of queries to this source, optionally only for the given package."""
+        if package_name is not None:
+            package_name = self.normalize_package_name(package_name)
+
+        return cache.invalidate(source_url=self.url, package_name=package_name)
+
     @staticmethod
     def normalize_package_name(package_name: str) -> str:
         """Normalize package name on index according to PEP-0503."""
@@ -126,42 +252,81 @@ class Source:
         """Use API of the deployed Warehouse to gather package version information."""
         url = self.get_api_url() + f"/{package_name}/{package_version}/json"
         _LOGGER.debug("Gathering package version information from Warehouse API: %r", url)
-        response = requests.get(url, verify=self.verify_ssl)
-        if response.status_code == 404:
-            raise NotFoundError(
-                f"Package {package_name} in version {package_version} not found on warehouse {self.url} ({self.name})"
-            )
-        if response.status_code == 403:
-            raise HTTPError(
-                f"Package {package_name} in version {package_version} doesn't exists on {self.url} ({self.name})"
-            )
-        response.raise_for_status()
-        return response.json()
+
+        def parse(response: requests.Response) -> dict:
+            if response.status_code == 404:
+                raise NotFoundError(
+                    f"Package {package_name} in version {package_version} not found "
+                    f"on warehouse {self.url} ({self.name})"
+                )
+            if response.status_code == 403:
+                raise HTTPError(
+                    f"Package {package_name} in version {package_version} doesn't exists on {self.url} ({self.name})"
+                )
+            response.raise_for_status()
+            return response.json()  # type: ignore
+
+        return cached_get(url, kind="warehouse-json", parse=parse, verify=self.verify_ssl)  # type: ignore
 
     def _warehouse_get_api_package_info(self, package_name: str) -> dict:
         """Use API of the deployed Warehouse to gather package information."""
         url = self.get_api_url() + f"/{package_name}/json"
         _LOGGER.debug("Gathering package information from Warehouse API: %r", url)
-        response = requests.get(url, verify=self.verify_ssl)
-        if response.status_code == 404:
-            raise NotFoundError(f"Package {package_name} not found on warehouse {self.url} ({self.name})")
-        if response.status_code == 403:
-            raise HTTPError(f"Package {package_name} doesn't exists on warehouse {self.url} ({self.name})")
-        response.raise_for_status()
-        return response.json()
+
+        def parse(response: requests.Response) -> dict:
+            if response.status_code == 404:
+                raise NotFoundError(f"Package {package_name} not found on warehouse {self.url} ({self.name})")
+            if response.status_code == 403:
+                raise HTTPError(f"Package {package_name} doesn't exists on warehouse {self.url} ({self.name})")
+            response.raise_for_status()
+            return response.json()  # type: ignore
+
+        return cached_get(url, kind="warehouse-json", parse=parse, verify=self.verify_ssl)  # type: ignore
+
+    @_cached
+    def _warehouse_get_listing(self, package_name: str) -> ArtifactListing:
+        """Retrieve artifacts of all the releases of the given package from Warehouse, indexed by version."""
+        return self._create_warehouse_listing(package_name, self._warehouse_get_api_package_info(package_name))
+
+    @staticmethod
+    def _create_warehouse_listing(package_name: str, package_info: dict) -> ArtifactListing:
+        """Create artifact listing out of package information as provided by Warehouse API."""
+        artifacts = []
+        for version, items in package_info.get("releases", {}).items():
+            for item in items:
+                artifacts.append(
+                    {
+                        "name": item["filename"],
+                        "url": item["url"],
+                        "sha256": item["digests"]["sha256"],
+                        "requires_python": item.get("requires_python"),
+                        "yanked": (item.get("yanked_reason") or True) if item.get("yanked") else False,
+                        "version": version,
+                        "python_version": item.get("python_version"),
+                        "upload_time": item.get("upload_time_iso_8601"),
+                    }
+                )
+
+        return ArtifactListing(package_name, artifacts, release_versions=list(package_info.get("releases", {})))
 
     def _warehouse_get_package_hashes(
         self, package_name: str, package_version: str, with_included_files: bool = False
     ) -> List[dict]:
         """Gather information about SHA hashes available for the given package-version release."""
-        package_info = self._warehouse_get_api_package_version_info(package_name, package_version)
+        listing = self._warehouse_get_listing(package_name)
+        if listing.has_version(package_version):
+            items = [(a["name"], a["url"], a["sha256"]) for a in listing.get_artifacts(package_version)]
+        else:
+            # Not listed in releases of the package, ask the release endpoint which can be more permissive.
+            package_info = self._warehouse_get_api_package_version_info(package_name, package_version)
+            items = [(i["filename"], i["url"], i["digests"]["sha256"]) for i in package_info["urls"]]
 
         result = []
-        for item in package_info["urls"]:
-            result.append({"name": item["filename"], "sha256": item["digests"]["sha256"]})
+        for artifact_name, artifact_url, sha256 in items:
+            result.append({"name": artifact_name, "sha256": sha256})
             # this checks whether to gather digests for all files in the given artifact
             if with_included_files:
-                artifact = Artifact(item["filename"], item["url"], verify_ssl=self.verify_ssl)
+                artifact = Artifact(artifact_name, artifact_url, verify_ssl=self.verify_ssl, sha=sha256)
                 result[-1]["digests"] = artifact.gather_hashes()
                 result[-1]["symbols"] = artifact.get_versioned_symbols()
 
@@ -173,44 +338,68 @@ class Source:
         # https://www.python.org/dev/peps/pep-0503/#normalized-names
         return cls._NORMALIZED_PACKAGE_NAME_RE.match(package_name) is not None
 
-    @lru_cache(maxsize=10)
-    def get_packages(self) -> set:
-        """List packages available on the source package index."""
+    @classmethod
+    def _parse_package_link(cls, href: str, link_text: str) -> Optional[str]:
+        """Get package name out of a link present on the root simple repository listing, if any."""
+        package_parts = href.rsplit("/", maxsplit=2)
+        # According to PEP-503, package names must have trailing '/', but check this explicitly
+        if not package_parts[-1]:
+            package_parts = package_parts[:-1]
+        package_name = package_parts[-1]
+
+        # Discard links to parent dirs (package name of URL does not match the text.
+        if link_text.endswith("/"):
+            # Link names should end with trailing / according to PEEP:
+            #   https://www.python.org/dev/peps/pep-0503/
+            link_text = link_text[:-1]
+
+        # Normalize link_text for comparison below
+        link_text = cls.normalize_package_name(link_text)
+
+        if cls.is_normalized_python_package_name(package_name) and package_name == link_text:
+            return package_name
+
+        return None
+
+    def iter_packages(self) -> Generator[str, None, None]:
+        """Iterate over packages available on the source package index.
+
+        The listing is parsed while it is being downloaded, package names are yielded as soon as they are seen
+        without building the whole document in memory.
+        """
         _LOGGER.debug(f"Discovering packages available on {self.url} (simple index name: {self.name})")
-        response = requests.get(self.url, verify=self.verify_ssl)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "lxml")
-        links = soup.find_all("a")
+        response = get_session().get(self.url, verify=self.verify_ssl, stream=True)
+        try:
+            response.raise_for_status()
 
-        packages = set()
-        for link in links:
-            package_parts = link["href"].rsplit("/", maxsplit=2)
-            # According to PEP-503, package names must have trailing '/', but check this explicitly
-            if not package_parts[-1]:
-                package_parts = package_parts[:-1]
-            package_name = package_parts[-1]
+            target = _PackageLinkTarget(self._parse_package_link)
+            parser = etree.HTMLParser(target=target, encoding="utf-8")
+            for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                parser.feed(chunk)
+                yield from target.pop_package_names()
 
-            # Discard links to parent dirs (package name of URL does not match the text.
-            link_text = link.text
-            if link_text.endswith("/"):
-                # Link names should end with trailing / according to PEEP:
-                #   https://www.python.org/dev/peps/pep-0503/
-                link_text = link_text[:-1]
+            parser.close()
+            yield from target.pop_package_names()
+        finally:
+            response.close()
 
-            # Normalize link_text for comparison below
-            link_text = self.normalize_package_name(link_text)
+    @_cached
+    def get_packages(self, compact: bool = False) -> Union[set, CompactPackageSet]:
+        """List packages available on the source package index.
 
-            if self.is_normalized_python_package_name(package_name) and package_name == link_text:
-                packages.add(package_name)
+        Optionally return package names in a compact form which is suitable for listings of large indexes.
+        """
+        if compact:
+            return CompactPackageSet(self.iter_packages())
 
-        return packages
+        return set(self.iter_packages())
 
     def provides_package(self, package_name: str) -> bool:
         """Check if the given package is provided by this package source index."""
         _LOGGER.debug("Checking availability of package %r on index %r", package_name, self.url)
         package_name = self.normalize_package_name(package_name)
         url = self.url + "/" + package_name
-        response = requests.get(url, verify=self.verify_ssl)
+        response = get_session().get(url, verify=self.verify_ssl)
 
         if response.status_code == 404:
             return False
@@ -244,24 +433,42 @@ class Source:
 
         return version
 
+    @_cached
+    def _simple_repository_get_listing(self, package_name: str) -> ArtifactListing:
+        """Retrieve artifacts available for the given package on a simple repository, indexed by version."""
+        return self._create_artifact_listing(package_name, self._simple_repository_list_artifact_links(package_name))
+
+    @classmethod
+    def _create_artifact_listing(cls, package_name: str, links: List[Dict[str, Any]]) -> ArtifactListing:
+        """Create artifact listing out of links to artifacts present on a simple repository.
+
+        Links to artifacts with names from which a version cannot be parsed are skipped.
+        """
+        artifacts = []
+        for link in links:
+            artifact = dict(link)
+            try:
+                artifact["version"] = cls._parse_artifact_version(package_name, link["name"])
+            except (ValueError, InternalError) as exc:
+                _LOGGER.debug("Skipping artifact %r of package %r: %s", link["name"], package_name, str(exc))
+                continue
+            artifacts.append(artifact)
+
+        return ArtifactListing(package_name, artifacts)
+
     def _simple_repository_list_versions(self, package_name: str) -> list:
         """List versions of package available on a simple repository."""
-        simple_repos = set()
-        for artifact_name, _ in self._simple_repository_list_artifacts(package_name):
-            simple_repos.add(self._parse_artifact_version(package_name, artifact_name))
-
-        result = list(simple_repos)
+        result = self._simple_repository_get_listing(package_name).versions()
         _LOGGER.debug("Versions available on %r (index with name %r): %r", self.url, self.name, result)
         return result
 
-    @lru_cache(maxsize=10)
+    @_cached
     def get_package_versions(self, package_name: str) -> list:
         """Get listing of versions available for the given package."""
         if not self.warehouse:
             return self._simple_repository_list_versions(package_name)
 
-        package_info = self._warehouse_get_api_package_info(package_name)
-        return list(package_info["releases"].keys())
+        return self._warehouse_get_listing(package_name).versions()
 
     def get_sorted_package_versions(
         self,
@@ -302,18 +509,85 @@ class Source:
             return None
         return semver_versions[0]
 
-    def _simple_repository_list_artifacts(self, package_name: str) -> list:
-        """Parse simple repository package listing (HTML) and return artifacts present there."""
+    def _simple_repository_list_artifact_links(self, package_name: str) -> List[Dict[str, Any]]:
+        """Retrieve artifacts listed on a simple repository, prefer JSON based API (PEP-691) if offered."""
         url = self.url + "/" + package_name
 
         _LOGGER.debug(f"Discovering package {package_name} artifacts from {url}")
-        response = requests.get(url, verify=self.verify_ssl)
-        if response.status_code == 404:
-            raise NotFoundError(f"Package {package_name} is not present on index {self.url} (index {self.name})")
-        if response.status_code == 403:
-            raise HTTPError(f"Package {package_name} is not present on index {self.url} (index {self.name})")
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "lxml")
+
+        def parse(response: requests.Response) -> list:
+            if response.status_code == 404:
+                raise NotFoundError(f"Package {package_name} is not present on index {self.url} (index {self.name})")
+            if response.status_code == 403:
+                raise HTTPError(f"Package {package_name} is not present on index {self.url} (index {self.name})")
+            response.raise_for_status()
+            return self._parse_simple_repository_listing(
+                package_name, url, response.headers.get("Content-Type"), response.text
+            )
+
+        return cached_get(  # type: ignore
+            url,
+            kind="simple-listing",
+            parse=parse,
+            verify=self.verify_ssl,
+            headers={"Accept": SIMPLE_API_ACCEPT},
+        )
+
+    def _simple_repository_list_artifacts(self, package_name: str) -> list:
+        """Parse simple repository package listing and return artifacts present there."""
+        return [(link["name"], link["url"]) for link in self._simple_repository_list_artifact_links(package_name)]
+
+    @classmethod
+    def _parse_simple_repository_listing(
+        cls, package_name: str, url: str, content_type: Optional[str], text: str
+    ) -> List[Dict[str, Any]]:
+        """Parse simple repository package listing based on the content type negotiated with the index."""
+        if content_type and content_type.split(";", maxsplit=1)[0].strip() == SIMPLE_API_JSON_CONTENT_TYPE:
+            return cls._parse_simple_repository_json(package_name, url, text)
+
+        return cls._parse_simple_repository_html(package_name, url, text)
+
+    @staticmethod
+    def _parse_simple_repository_json(package_name: str, url: str, text: str) -> List[Dict[str, Any]]:
+        """Parse simple repository package listing as served by JSON based simple API (PEP-691)."""
+        document = json.loads(text)
+
+        api_version = document.get("meta", {}).get("api-version", "1.0")
+        if api_version.split(".", maxsplit=1)[0] != "1":
+            raise InternalError(f"Unsupported simple repository API version {api_version!r} served by {url}")
+
+        artifacts = []
+        for item in document.get("files", []):
+            artifact_name = item["filename"]
+            if not artifact_name.endswith((".tar.gz", ".whl")):
+                _LOGGER.debug("File does not look like a package for %r: %r", package_name, artifact_name)
+                continue
+
+            artifact_url = urljoin(url, item["url"])
+            sha256 = item.get("hashes", {}).get("sha256")
+            if sha256 and "#" not in artifact_url:
+                # Keep digests in URL fragments as served in HTML listings, artifacts use them to avoid downloads.
+                artifact_url += f"#sha256={sha256}"
+
+            artifacts.append(
+                {
+                    "name": artifact_name,
+                    "url": artifact_url,
+                    "sha256": sha256,
+                    "requires_python": item.get("requires-python"),
+                    "yanked": item.get("yanked", False),
+                    "core_metadata": Source._parse_core_metadata_availability(
+                        item.get("core-metadata", item.get("dist-info-metadata"))
+                    ),
+                }
+            )
+
+        return artifacts
+
+    @staticmethod
+    def _parse_simple_repository_html(package_name: str, url: str, text: str) -> List[Dict[str, Any]]:
+        """Parse simple repository package listing as served by HTML based simple API (PEP-503)."""
+        soup = BeautifulSoup(text, "lxml")
 
         links = soup.find_all("a")
         artifacts = []
@@ -325,9 +599,12 @@ class Source:
             else:
                 artifact_name = artifact_names[0]
 
+            sha256 = None
             artifact_parts = artifact_name.rsplit("#", maxsplit=1)
             if len(artifact_parts) == 2:
                 artifact_name = artifact_parts[0]
+                if artifact_parts[1].startswith("sha256="):
+                    sha256 = artifact_parts[1][len("sha256=") :]
 
             if not artifact_name.endswith((".tar.gz", ".whl")):
                 _LOGGER.debug("Link does not look like a package for %r: %r", package_name, link["href"])
@@ -340,31 +617,135 @@ class Source:
             # Decode characters in link retrieved
             artifact_name = unquote(artifact_name)
 
-            artifacts.append((artifact_name, artifact_url))
+            yanked = link.get("data-yanked")
+            artifacts.append(
+                {
+                    "name": artifact_name,
+                    "url": artifact_url,
+                    "sha256": sha256,
+                    "requires_python": link.get("data-requires-python"),
+                    # An empty data-yanked attribute still marks the artifact as yanked.
+                    "yanked": (yanked or True) if yanked is not None else False,
+                    "core_metadata": Source._parse_core_metadata_availability(
+                        link.get("data-core-metadata", link.get("data-dist-info-metadata"))
+                    ),
+                }
+            )
 
         return artifacts
 
+    @staticmethod
+    def _parse_core_metadata_availability(value: Any) -> Optional[Dict[str, str]]:
+        """Parse availability of core metadata file as stated in simple repository listing (PEP-658, PEP-714).
+
+        Return hashes of the core metadata file (possibly empty) if available, None if not available.
+        """
+        if value is None or value is False:
+            return None
+
+        if isinstance(value, dict):
+            return {str(algorithm): str(digest) for algorithm, digest in value.items()}
+
+        # HTML listings state "<hashname>=<hashvalue>" or "true" if the hash is not available.
+        algorithm, sep, digest = str(value).partition("=")
+        return {algorithm: digest} if sep else {}
+
+    @staticmethod
+    def _get_core_metadata_artifacts(listing: ArtifactListing, package_version: str) -> List[Dict[str, Any]]:
+        """Get artifacts from which core metadata can be obtained, artifacts with metadata files and wheels first."""
+        artifacts = listing.get_artifacts(package_version)
+        if not artifacts:
+            raise NotFoundError(f"No artifacts found for {listing.package_name} in version {package_version}")
+
+        return sorted(
+            artifacts,
+            key=lambda artifact: (artifact.get("core_metadata") is None, not artifact["name"].endswith(".whl")),
+        )
+
+    @staticmethod
+    def _get_core_metadata_url(artifact_info: Dict[str, Any]) -> str:
+        """Get URL of the core metadata file served for the given artifact (PEP-658)."""
+        return artifact_info["url"].split("#", maxsplit=1)[0] + ".metadata"  # type: ignore
+
+    @staticmethod
+    def _verify_core_metadata(artifact_info: Dict[str, Any], content: bytes) -> bool:
+        """Verify core metadata file retrieved against hashes stated in the listing."""
+        for algorithm, digest in (artifact_info.get("core_metadata") or {}).items():
+            if algorithm not in hashlib.algorithms_available:
+                continue
+
+            if hashlib.new(algorithm, content).hexdigest() != digest:
+                _LOGGER.warning(
+                    "Digest of core metadata of %r does not match the one stated (%s=%s)",
+                    artifact_info["name"],
+                    algorithm,
+                    digest,
+                )
+                return False
+
+        return True
+
+    @staticmethod
+    def _parse_core_metadata(content: bytes) -> Dict[str, Any]:
+        """Parse core metadata, field names and values are reported as described in PEP-566."""
+        message = email.message_from_string(content.decode("utf-8", errors="replace"))
+
+        result = {}  # type: Dict[str, Any]
+        for key, value in message.items():
+            field = key.lower().replace("-", "_")
+            if field in _MULTIPLE_USE_METADATA_FIELDS:
+                result.setdefault(field, []).append(value)
+            else:
+                result[field] = value
+
+        payload = message.get_payload()
+        if payload and "description" not in result:
+            result["description"] = payload
+
+        return result
+
+    @_cached
+    def get_package_metadata(self, package_name: str, package_version: str) -> Dict[str, Any]:
+        """Get core metadata of the given package in the given version.
+
+        If the index serves core metadata files next to artifacts (PEP-658, PEP-714), only the metadata file is
+        retrieved. Otherwise, metadata are read from an artifact - wheels are preferred and read remotely if
+        possible. Field names are lowercase with underscores, multiple-use fields are reported as lists (PEP-566).
+        """
+        artifacts = self._get_core_metadata_artifacts(
+            self._simple_repository_get_listing(package_name), package_version
+        )
+        for artifact_info in artifacts:
+            if artifact_info.get("core_metadata") is None:
+                break
+
+            url = self._get_core_metadata_url(artifact_info)
+            _LOGGER.debug("Retrieving core metadata of %r from %r", artifact_info["name"], url)
+            response = get_session().get(url, verify=self.verify_ssl)
+            if response.status_code == 404:
+                _LOGGER.debug("Core metadata file %r advertised but not found", url)
+                continue
+
+            response.raise_for_status()
+            if self._verify_core_metadata(artifact_info, response.content):
+                return self._parse_core_metadata(response.content)
+
+        artifact_info = artifacts[0]
+        artifact = Artifact(
+            artifact_info["name"], artifact_info["url"], verify_ssl=self.verify_ssl, sha=artifact_info.get("sha256")
+        )
+        return self._parse_core_metadata(artifact.read_metadata())
+
     def _download_artifacts_data(
         self, package_name: str, package_version: str, with_included_files: bool = False
     ) -> Generator[tuple, None, None]:
         """Download the given artifact from Warehouse and compute desired info."""
-        possible_continuations = [".win32", ".tar.gz", ".whl", ".zip", ".exe", ".egg", "-"]
-        for artifact_name, artifact_url in self._simple_repository_list_artifacts(package_name):
-            # Convert all artifact names to lowercase - as a shortcut we simply convert everything to lowercase.
-            artifact_name.lower()
-
-            for i in possible_continuations:
-                if artifact_name.startswith(f"{package_name}-{package_version}{i}"):
-                    break
-            else:
-                _LOGGER.debug(
-                    "Skipping artifact %r as it does not match required version %r for package %r",
-                    artifact_name,
-                    package_version,
-                    package_name,
-                )
-                continue
-            artifact = Artifact(artifact_name, artifact_url, verify_ssl=self.verify_ssl)
+        listing = self._simple_repository_get_listing(package_name)
+        for artifact_info in listing.get_artifacts(package_version):
+            artifact_name, artifact_url = artifact_info["name"], artifact_info["url"]
+            artifact = Artifact(
+                artifact_name, artifact_url, verify_ssl=self.verify_ssl, sha=artifact_info.get("sha256")
+            )
 
             symbols = None
             hashes = None
@@ -387,34 +768,22 @@ class Source:
             # Package was not found on the index.
             return False
 
-    @lru_cache(maxsize=10)
+    @_cached
     def get_package_hashes(self, package_name: str, package_version: str, with_included_files: bool = False) -> list:
         """Get information about release hashes available in this source index."""
         if self.warehouse:
             return self._warehouse_get_package_hashes(package_name, package_version, with_included_files)
 
         result = []
-        possible_continuations = [".win32", ".tar.gz", ".whl", ".zip", ".exe", ".egg", "-"]
-        for artifact_name, artifact_url in self._simple_repository_list_artifacts(package_name):
+        listing = self._simple_repository_get_listing(package_name)
+        for artifact_info in listing.get_artifacts(package_version):
             # Convert all artifact names to lowercase - as a shortcut we simply convert everything to lowercase.
-            artifact_name = artifact_name.lower()
-
-            for i in possible_continuations:
-                if (
-                    artifact_name.startswith(f"{package_name}-{package_version}")
-                    or artifact_name.startswith(f"{package_name.replace('-', '_')}-{package_version}")
-                ) and artifact_name.endswith(i):
-                    break
-            else:
-                _LOGGER.debug(
-                    "Skipping artifact %r as it does not match required version %r for package %r",
-                    artifact_name,
-                    package_version,
-                    package_name,
-                )
-                continue
+            artifact_name = artifact_info["name"].lower()
+            artifact_url = artifact_info["url"]
 
-            artifact_obj = Artifact(artifact_name, artifact_url, verify_ssl=self.verify_ssl)
+            artifact_obj = Artifact(
+                artifact_name, artifact_url, verify_ssl=self.verify_ssl, sha=artifact_info.get("sha256")
+            )
             doc = {}  # type: Dict[str, Union[str, List, Dict]]
             doc["name"] = artifact_obj.artifact_name
             doc["sha256"] = artifact_obj.sha
@@ -425,20 +794,56 @@ class Source:
 
         return result
 
+    def get_package_hashes_many(
+        self,
+        packages: Iterable[Tuple[str, str]],
+        *,
+        with_included_files: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> List[PackageHashesResult]:
+        """Get release hashes for the given package name and version pairs concurrently.
+
+        Results are returned in the order of the packages given, a failure to obtain hashes for a package
+        is reported in the corresponding result instead of failing the whole batch. The number of worker
+        threads defaults to the size of the HTTP connection pool.
+        """
+        packages = list(packages)
+        if not packages:
+            return []
+
+        def get_hashes(package: Tuple[str, str]) -> PackageHashesResult:
+            package_name, package_version = package
+            try:
+                hashes = self.get_package_hashes(package_name, package_version, with_included_files=with_included_files)
+            except Exception as exc:
+                _LOGGER.debug(
+                    "Failed to obtain hashes for %r in version %r from %r: %s",
+                    package_name,
+                    package_version,
+                    self.url,
+                    str(exc),
+                )
+                return PackageHashesResult(package_name=package_name, package_version=package_version, error=exc)
+
+            return PackageHashesResult(package_name=package_name, package_version=package_version, hashes=hashes)
+
+        max_workers = min(max_workers or config.http_pool_maxsize, len(packages))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(get_hashes, packages))
+
     def get_package_release_date(
         self,
         package_name: str,
         package_version: str,
     ) -> datetime:
         """Get time at which package was uploaded to package index."""
-        package_json = self._warehouse_get_api_package_info(package_name)
-        release = package_json["releases"].get(package_version)
-        if release is None:
+        listing = self._warehouse_get_listing(package_name)
+        if not listing.has_version(package_version):
             raise NotFoundError(f"Version {package_version} not found for {package_name} on {self.warehouse_api_url}.")
-        artifact = next(x for x in release if x["python_version"] == "source")
+        artifact = next((a for a in listing.get_artifacts(package_version) if a["python_version"] == "source"), None)
         if artifact is None:
             raise NotFoundError(
                 f"No source distribution for {package_name}==={package_version} found on {self.warehouse_api_url}."
             )
 
-        return parse_datetime(artifact["upload_time_iso_8601"][:-1])
+        return parse_datetime(artifact["upload_time"][:-1])